@@ -0,0 +1,35 @@
+import os
+
+import pygame
+
+# 可选的 pygame 后端：
+#   display   打开真实窗口
+#   offscreen 用 SDL 的 dummy 视频驱动初始化显示模块，set_mode、事件等接口照常可用，但不显示窗口
+#   headless  不初始化显示模块，只初始化字体，直接绘制到普通表面；启动最快，适合批量导出和工作进程
+BACKENDS = ("display", "offscreen", "headless")
+
+
+def init_pygame(backend="display"):
+    """按后端初始化 pygame 中用到的模块，可以重复调用
+
+    导入动画脚本不会初始化 pygame，使用前由调用方选择后端并调用本函数。
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"未知后端: {backend}（可选 {', '.join(BACKENDS)}）")
+    if backend != "headless":
+        if backend == "offscreen" and not pygame.display.get_init():
+            # 必须在初始化显示模块之前设置
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+        pygame.display.init()
+    pygame.font.init()
+
+
+def open_display(size, fullscreen=False, caption=None):
+    """创建窗口并返回窗口表面；fullscreen 时使用桌面分辨率"""
+    if fullscreen:
+        screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    else:
+        screen = pygame.display.set_mode(size)
+    if caption:
+        pygame.display.set_caption(caption)
+    return screen
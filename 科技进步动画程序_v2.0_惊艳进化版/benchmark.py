@@ -0,0 +1,319 @@
+"""可复现的性能基准：无窗口运行两个 pygame 动画并扫描参数
+
+每个用例用固定种子推进固定帧数，分别统计 update() 与 draw() 的吞吐量（次/秒）
+以及进程内存峰值（RSS，含 SDL 表面、缓存图层和精灵缓存），可保存为基准文件，
+之后与基准比较以发现性能退化。
+
+用法示例：
+    python benchmark.py --save-baseline benchmark_baseline.json
+    python benchmark.py --baseline benchmark_baseline.json
+    python benchmark.py --scripts images --bursts 20,200 --resolutions 720p,4k
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import multiprocessing
+import multiprocessing.forkserver
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # Windows 没有 resource 模块，不统计内存峰值
+    resource = None
+
+import numpy as np
+import pygame
+
+from backend import init_pygame
+from headless_render import SCRIPTS, load_engine
+from milestone_data import TIMELINE_LEFT, layout_timeline
+
+RESOLUTIONS = {
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+}
+
+# 合成里程碑之间的间距（像素）
+SYNTHETIC_SPACING = 130
+
+# 扫描某个参数时其余参数保持脚本的默认值
+DEFAULT_RESOLUTION = "720p"
+
+# 除节点激活外，每隔这么多帧在最新激活的节点处再爆发一次，粒子数稳定在 爆发数量 × 100 / 间隔 左右
+BURST_INTERVAL = 10
+
+
+def synthetic_milestones(count):
+    """生成 count 个等间距的里程碑，用于测试数据规模的影响"""
+    records = [{"name": f"里程碑 {i + 1}", "year": str(1000 + i), "era": "基准测试", "icon": None}
+               for i in range(count)]
+    right = TIMELINE_LEFT + max(count - 1, 1) * SYNTHETIC_SPACING
+    return layout_timeline(records, TIMELINE_LEFT, right)
+
+
+def machine_info():
+    """记录运行基准的机器与软件版本；吞吐量只有在同一台机器上才能直接比较"""
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(map(str, pygame.get_sdl_version())),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+@contextmanager
+def configured(engine, burst, flows, stars, resolution):
+    """临时修改动画脚本的模块级参数，退出时恢复；返回渲染分辨率"""
+    overrides = {
+        "PARTICLE_BURST": burst,
+        "FLOWS_PER_CONNECTION": flows,
+        "STAR_COUNT": stars,
+    }
+    saved = {name: getattr(engine, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(engine, name, value)
+    try:
+        yield RESOLUTIONS[resolution]
+    finally:
+        for name, value in saved.items():
+            setattr(engine, name, value)
+
+
+def run_case(engine, frames, seed, milestones, width, height, burst_interval=BURST_INTERVAL):
+    """推进并绘制 frames 帧，返回 (update 耗时, draw 耗时)
+
+    burst_interval 不为 0 时每隔这么多帧在最新激活的节点处额外爆发 PARTICLE_BURST 个粒子，
+    让爆发数量的扫描在整段计时内都有大量存活的粒子；额外爆发计入 update 耗时。
+    """
+    surface = pygame.Surface((width, height))
+    animation = engine.TechEvolutionAnimation(seed=seed, milestones=milestones, size=(width, height))
+
+    update_time = 0.0
+    draw_time = 0.0
+    for index in range(frames):
+        start = time.perf_counter()
+        animation.update()
+        if burst_interval and index % burst_interval == 0 and animation.current_node > 0:
+            node = animation.nodes[animation.current_node - 1]
+            animation.particle_system.emit(node.x, node.y, engine.PARTICLE_BURST)
+        middle = time.perf_counter()
+        animation.draw(surface)
+        update_time += middle - start
+        draw_time += time.perf_counter() - middle
+    return update_time, draw_time
+
+
+def case_milestones(engine, count):
+    """用例使用的里程碑：数量与内置数据相同时用内置数据，否则生成合成数据"""
+    return engine.tech_milestones if count == len(engine.tech_milestones) else synthetic_milestones(count)
+
+
+def peak_rss_kb():
+    """当前进程的内存峰值（KB）；Linux 的 ru_maxrss 单位为 KB，macOS 为字节"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 if sys.platform == "darwin" else peak
+
+
+def _measure_memory(script, params, frames, seed, burst_interval):
+    """在独立的子进程中运行一个用例，返回该进程的内存峰值（KB）"""
+    init_pygame("headless")
+    engine = load_engine(script)
+    milestones = case_milestones(engine, params["milestones"])
+    with configured(engine, params["burst"], params["flows"], params["stars"],
+                    params["resolution"]) as (width, height):
+        run_case(engine, frames, seed, milestones, width, height, burst_interval)
+    return peak_rss_kb()
+
+
+def measure_memory(script, params, frames, seed, burst_interval):
+    """用新启动的子进程单独跑一遍用例并返回进程内存峰值（KB）
+
+    Linux 的 ru_maxrss 在 fork 和 exec 之后都会保留父进程的峰值，因此子进程由运行用例之前
+    就已启动的 forkserver 派生，不继承基准进程跑过大分辨率用例后的峰值。各用例的峰值都包含
+    解释器、pygame 与 NumPy 本身的固定开销，用例之间的差别来自表面、缓存和对象数量。
+    """
+    context = multiprocessing.get_context("forkserver")
+    with context.Pool(1) as pool:
+        return pool.apply(_measure_memory, (script, params, frames, seed, burst_interval))
+
+
+def build_cases(args):
+    """按参数逐一扫描，返回 (用例名, 脚本, 参数) 列表"""
+    sweeps = {
+        "burst": args.bursts,
+        "milestones": args.milestones,
+        "flows": args.flows,
+        "stars": args.stars,
+        "resolution": args.resolutions,
+    }
+    cases = []
+    for script in args.scripts:
+        engine = load_engine(script)
+        defaults = {
+            "burst": engine.PARTICLE_BURST,
+            "milestones": len(engine.tech_milestones),
+            "flows": engine.FLOWS_PER_CONNECTION,
+            "stars": engine.STAR_COUNT,
+            "resolution": DEFAULT_RESOLUTION,
+        }
+        seen = set()
+        for key, values in sweeps.items():
+            for value in values:
+                params = dict(defaults, **{key: value})
+                name = f"{script}/" + ",".join(f"{k}={v}" for k, v in params.items())
+                if name not in seen:
+                    seen.add(name)
+                    cases.append((name, script, params))
+    return cases
+
+
+def run_benchmarks(args):
+    results = {}
+    for name, script, params in build_cases(args):
+        engine = load_engine(script)
+        milestones = case_milestones(engine, params["milestones"])
+        with configured(engine, params["burst"], params["flows"], params["stars"],
+                        params["resolution"]) as (width, height):
+            update_time, draw_time = run_case(engine, args.frames, args.seed, milestones, width, height,
+                                              args.burst_interval)
+        peak = 0
+        if not args.no_memory and resource is not None:
+            # 在子进程中单独跑一遍，峰值只反映本用例
+            peak = measure_memory(script, params, args.frames, args.seed, args.burst_interval)
+        results[name] = {
+            "update_fps": args.frames / update_time,
+            "draw_fps": args.frames / draw_time,
+            "peak_rss_kb": peak,
+        }
+        print(f"{name:<55} update {results[name]['update_fps']:>9.0f}/s  "
+              f"draw {results[name]['draw_fps']:>7.0f}/s  峰值 {peak / 1024:>6.1f} MB",
+              flush=True)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """与基准比较，返回退化项的描述列表
+
+    吞吐量下降或内存增长超过 tolerance 比例视为退化；基准中没有的用例只报告不比较。
+    """
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name}: 基准中没有该用例，跳过比较")
+            continue
+        for key in ("update_fps", "draw_fps"):
+            if current[key] < reference[key] * (1 - tolerance):
+                regressions.append(f"{name} {key}: {reference[key]:.0f} -> {current[key]:.0f}")
+        # 小于 4MB 的内存波动忽略不计；基准没有统计内存（或是旧格式）时不比较
+        reference_peak = reference.get("peak_rss_kb")
+        if reference_peak and current["peak_rss_kb"] > max(reference_peak * (1 + tolerance),
+                                                           reference_peak + 4096):
+            regressions.append(f"{name} peak_rss_kb: {reference_peak:.0f} -> {current['peak_rss_kb']:.0f}")
+    return regressions
+
+
+def _list(convert):
+    return lambda text: [convert(item) for item in text.split(",") if item]
+
+
+def _resolution(name):
+    name = name.lower()
+    if name not in RESOLUTIONS:
+        raise argparse.ArgumentTypeError(f"未知分辨率: {name}（可选 {', '.join(RESOLUTIONS)}）")
+    return name
+
+
+def _script(name):
+    if name not in SCRIPTS:
+        raise argparse.ArgumentTypeError(f"未知脚本: {name}（可选 {', '.join(sorted(SCRIPTS))}）")
+    return name
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="科技进步动画的性能基准")
+    parser.add_argument("--scripts", type=_list(_script), default=["basic", "images"],
+                        help="要测试的动画版本，逗号分隔")
+    parser.add_argument("--frames", type=int, default=1200,
+                        help="每个用例推进的帧数（默认 1200，覆盖全部节点激活）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--bursts", type=_list(int), default=[20, 100, 500],
+                        help="扫描的粒子爆发数量")
+    parser.add_argument("--burst-interval", type=int, default=BURST_INTERVAL,
+                        help=f"除节点激活外每隔多少帧再爆发一次粒子（默认 {BURST_INTERVAL}，0 表示只在节点激活时爆发）")
+    parser.add_argument("--milestones", type=_list(int), default=[8, 100, 1000],
+                        help="扫描的里程碑数量")
+    parser.add_argument("--flows", type=_list(int), default=[3, 30, 100],
+                        help="扫描的每条连接线数据流数量")
+    parser.add_argument("--stars", type=_list(int), default=[50, 10000],
+                        help="扫描的背景星星数量")
+    parser.add_argument("--resolutions", type=_list(_resolution), default=list(RESOLUTIONS),
+                        help="扫描的分辨率（720p、1080p、4k）")
+    parser.add_argument("--no-memory", action="store_true", help="不统计内存峰值（每个用例少启动一个子进程）")
+    parser.add_argument("--output", metavar="FILE", help="把本次结果写入 JSON 文件")
+    parser.add_argument("--save-baseline", metavar="FILE", help="把本次结果保存为基准")
+    parser.add_argument("--baseline", metavar="FILE", help="与基准文件比较，发现退化时返回非零退出码")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="允许的性能波动比例（默认 0.15）")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    init_pygame("headless")
+    if not args.no_memory:
+        if resource is None:
+            print("当前平台不支持统计进程内存峰值，只测吞吐量", file=sys.stderr)
+        else:
+            # 在运行任何用例之前启动 forkserver，之后的子进程都由这个内存占用很小的进程派生
+            multiprocessing.get_context("forkserver")
+            multiprocessing.forkserver.ensure_running()
+    results = run_benchmarks(args)
+    report = {
+        "meta": {
+            **machine_info(),
+            "frames": args.frames,
+            "seed": args.seed,
+            "burst_interval": args.burst_interval,
+        },
+        "cases": results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        meta = baseline.get("meta", {})
+        if meta.get("frames") != args.frames or meta.get("burst_interval") != args.burst_interval:
+            print("警告：基准的帧数或爆发间隔与本次不同，结果不可直接比较", file=sys.stderr)
+        changed = [key for key, value in machine_info().items() if key in meta and meta[key] != value]
+        if changed:
+            print(f"警告：基准记录于不同的机器或软件版本（{', '.join(changed)}），"
+                  "请在本机重新记录基准", file=sys.stderr)
+        regressions = compare(results, baseline.get("cases", {}), args.tolerance)
+        if regressions:
+            print("发现性能退化：", file=sys.stderr)
+            for line in regressions:
+                print("  " + line, file=sys.stderr)
+            status = 1
+        else:
+            print("与基准相比没有退化")
+    pygame.quit()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
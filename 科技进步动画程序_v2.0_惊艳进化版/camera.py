@@ -0,0 +1,63 @@
+class Camera:
+    """沿时间轴水平平移的镜头
+
+    x 为视口左边缘在世界坐标中的位置。镜头缓动地跟随最新激活的节点，
+    并限制在世界范围之内；时间轴比屏幕短时镜头保持不动。
+    """
+
+    def __init__(self, view_width, world_width, anchor=0.6, easing=0.05):
+        self.view_width = view_width
+        self.world_width = world_width
+        self.anchor = anchor
+        self.easing = easing
+        self.x = 0.0
+        self.target_x = 0.0
+
+    def clamp(self, x):
+        return min(max(x, 0.0), max(0.0, self.world_width - self.view_width))
+
+    def follow(self, world_x):
+        """让世界坐标 world_x 最终停在视口宽度 anchor 比例处"""
+        self.target_x = self.clamp(world_x - self.view_width * self.anchor)
+
+    def jump(self, world_x):
+        """立即移动到跟随 world_x 的位置，不做缓动"""
+        self.follow(world_x)
+        self.x = self.target_x
+
+    def update(self):
+        delta = self.target_x - self.x
+        if abs(delta) < 0.5:
+            self.x = self.target_x
+        else:
+            self.x += delta * self.easing
+
+    def position(self, interp=0.0):
+        """按 update() 的缓动推算两次模拟步之间 interp 处的镜头位置"""
+        delta = self.target_x - self.x
+        if abs(delta) >= 0.5:
+            delta *= self.easing
+        return self.x + delta * interp
+
+    def interpolated(self, interp):
+        """位于 position(interp) 的镜头副本，只用于绘制，不影响模拟"""
+        view = Camera(self.view_width, self.world_width, self.anchor, self.easing)
+        view.x = self.position(interp)
+        view.target_x = self.target_x
+        return view
+
+    def snapshot(self):
+        return self.x, self.target_x
+
+    def restore(self, state):
+        self.x, self.target_x = state
+
+    @property
+    def offset(self):
+        """世界坐标到屏幕坐标的整数偏移量"""
+        return int(round(self.x))
+
+    def visible(self, margin=0):
+        """返回视口在世界坐标中的范围 (left, right)，两侧各扩展 margin"""
+        left = self.offset
+        return left - margin, left + self.view_width + margin
@@ -0,0 +1,181 @@
+import numpy as np
+
+from particle_system import grid_rects
+from sprite_cache import dot_sprite, scaled_radius
+
+# 数据流速度范围（每步前进的进度比例），与原先逐对象的 DataFlow 保持一致
+FLOW_MIN_SPEED = 0.01
+FLOW_MAX_SPEED = 0.03
+# 流动点半径，以及尾迹点数与相邻尾迹点的进度间隔
+FLOW_HEAD_RADIUS = 3
+FLOW_TRAIL_POINTS = 5
+FLOW_TRAIL_SPACING = 0.05
+
+# 尾迹点半径逐个递减，半径为 0 的点不绘制
+_TRAIL_OFFSETS = np.arange(FLOW_TRAIL_POINTS) * FLOW_TRAIL_SPACING
+_TRAIL_RADII = (2 * (1 - np.arange(FLOW_TRAIL_POINTS) / FLOW_TRAIL_POINTS)).astype(np.int32)
+_TRAIL_OFFSETS = _TRAIL_OFFSETS[_TRAIL_RADII > 0]
+_TRAIL_RADII = _TRAIL_RADII[_TRAIL_RADII > 0]
+# 实际绘制的尾迹点数
+TRAIL_POINTS = len(_TRAIL_OFFSETS)
+
+
+class DataFlowField:
+    """共享的数据流集合
+
+    所有数据流的起终点、进度、速度与颜色存放在 NumPy 数组中，每步一次批量推进进度，
+    绘制时一次算出全部流动点与尾迹点的位置，按数据流的先后顺序用预渲染精灵批量 blit。
+    数量达到 max_flows 后，新加入的数据流循环复用最早的槽位。
+    trail_points 限制每条数据流绘制的尾迹点数，负载高时可以减少。
+    """
+
+    def __init__(self, palette, max_flows=4096, capacity=64, rng=None):
+        self.palette = list(palette)
+        self.max_flows = max_flows
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.count = 0
+        self.trail_points = TRAIL_POINTS
+        # 达到上限后下一个被复用的槽位
+        self._recycle = 0
+        self._allocate(min(capacity, max_flows))
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.start_x = np.zeros(capacity, dtype=np.float64)
+        self.start_y = np.zeros(capacity, dtype=np.float64)
+        self.end_x = np.zeros(capacity, dtype=np.float64)
+        self.end_y = np.zeros(capacity, dtype=np.float64)
+        self.progress = np.zeros(capacity, dtype=np.float64)
+        self.speed = np.zeros(capacity, dtype=np.float64)
+        self.color = np.zeros(capacity, dtype=np.uint8)
+
+    def _arrays(self):
+        return (self.start_x, self.start_y, self.end_x, self.end_y,
+                self.progress, self.speed, self.color)
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        capacity = min(capacity, self.max_flows)
+        old = self._arrays()
+        n = self.count
+        self._allocate(capacity)
+        for new_arr, old_arr in zip(self._arrays(), old):
+            new_arr[:n] = old_arr[:n]
+
+    def __len__(self):
+        return self.count
+
+    def _slots(self, count):
+        """为 count 条新数据流分配槽位：先用空闲槽位，满了之后循环复用最早的槽位"""
+        free = min(count, self.max_flows - self.count)
+        if self.count + free > self.capacity:
+            self._grow(self.count + free)
+        slots = np.arange(self.count, self.count + free)
+        self.count += free
+
+        reused = count - free
+        if reused > 0:
+            recycled = (self._recycle + np.arange(reused)) % self.max_flows
+            self._recycle = int(recycled[-1] + 1) % self.max_flows
+            slots = np.concatenate((slots, recycled))
+        # 超出上限的部分只保留最后写入的 max_flows 条
+        return slots[-self.max_flows:]
+
+    def add(self, start_x, start_y, end_x, end_y, count):
+        """在 (start_x, start_y) 与 (end_x, end_y) 之间加入 count 条数据流"""
+        if count <= 0:
+            return
+        slots = self._slots(count)
+        n = len(slots)
+        self.start_x[slots] = start_x
+        self.start_y[slots] = start_y
+        self.end_x[slots] = end_x
+        self.end_y[slots] = end_y
+        self.progress[slots] = 0
+        self.speed[slots] = self.rng.uniform(FLOW_MIN_SPEED, FLOW_MAX_SPEED, n)
+        self.color[slots] = self.rng.integers(0, len(self.palette), n)
+
+    def update(self):
+        n = self.count
+        if n == 0:
+            return
+        progress = self.progress[:n]
+        progress += self.speed[:n]
+        # 到达终点后从起点重新开始
+        progress[progress > 1] = 0
+
+    def snapshot(self):
+        """返回全部数据流状态的副本，供 restore() 恢复"""
+        n = self.count
+        return self._recycle, tuple(arr[:n].copy() for arr in self._arrays())
+
+    def restore(self, state):
+        recycle, arrays = state
+        n = len(arrays[0])
+        self.count = 0
+        if n > self.capacity:
+            self._grow(n)
+        for arr, saved in zip(self._arrays(), arrays):
+            arr[:n] = saved
+        self.count = n
+        self._recycle = recycle
+
+    def _points(self, offset_x, interp, scale):
+        """返回全部流动点与尾迹点的像素坐标、设计半径与颜色下标（一维数组），按数据流的先后顺序排列"""
+        n = self.count
+        # 按加入的先后顺序排列，达到上限后从最早的槽位开始，重叠处后加入的数据流在上
+        slots = np.arange(n)
+        if self._recycle:
+            slots = np.roll(slots, -self._recycle)
+        # 在两次模拟步之间按插值系数前推进度，进度为 0 的数据流不绘制
+        progress = self.progress[slots]
+        progress = np.where(progress > 0, np.minimum(progress + self.speed[slots] * interp, 1), 0)
+        keep = progress > 0
+        moving = slots[keep]
+        progress = progress[keep]
+
+        # 每条数据流一行：第 0 列为流动点，其余为尾迹点
+        steps = np.concatenate(([0.0], _TRAIL_OFFSETS[:self.trail_points]))
+        radii = np.concatenate(([FLOW_HEAD_RADIUS], _TRAIL_RADII[:self.trail_points]))
+        t = progress[:, None] - steps[None, :]
+        visible = t > 0
+
+        start_x = self.start_x[moving, None] - offset_x
+        start_y = self.start_y[moving, None]
+        px = (start_x + (self.end_x[moving, None] - offset_x - start_x) * t)[visible] * scale
+        py = (start_y + (self.end_y[moving, None] - start_y) * t)[visible] * scale
+        radius = np.broadcast_to(radii, t.shape)[visible]
+        color = np.broadcast_to(self.color[moving, None], t.shape)[visible]
+        return px.astype(np.int32), py.astype(np.int32), radius, color
+
+    def dirty_rects(self, offset_x=0, interp=0.0, scale=1.0, cell=64):
+        """返回覆盖全部流动点与尾迹的粗粒度网格矩形，用于脏矩形刷新"""
+        if self.count == 0:
+            return []
+        px, py, _, _ = self._points(offset_x, interp, scale)
+        return grid_rects(px, py, scaled_radius(FLOW_HEAD_RADIUS, scale), cell)
+
+    def draw(self, surface, offset_x=0, interp=0.0, scale=1.0):
+        """绘制全部数据流
+
+        offset_x 为镜头在世界坐标中的水平偏移，interp 为两次模拟步之间的插值系数，
+        scale 为每个设计单位对应的像素数。
+        """
+        if self.count == 0:
+            return
+        px, py, radius, color = self._points(offset_x, interp, scale)
+
+        # 剔除视口之外的点
+        margin = scaled_radius(FLOW_HEAD_RADIUS, scale)
+        onscreen = (px >= -margin) & (px < surface.get_width() + margin)
+        if not onscreen.all():
+            px, py, radius, color = px[onscreen], py[onscreen], radius[onscreen], color[onscreen]
+
+        # 逐条数据流按顺序绘制，与逐个对象绘制时的覆盖关系相同；不同精灵混在同一次 blits 中
+        pixel_radii = [scaled_radius(r, scale) for r in range(FLOW_HEAD_RADIUS + 1)]
+        sprites = [[dot_sprite(r, color) for color in self.palette] for r in pixel_radii]
+        offset = np.array(pixel_radii)[radius]
+        surface.blits([(sprites[r][c], (x, y)) for x, y, r, c in
+                       zip((px - offset).tolist(), (py - offset).tolist(), radius.tolist(), color.tolist())], False)
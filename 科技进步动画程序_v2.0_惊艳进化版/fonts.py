@@ -0,0 +1,164 @@
+import os
+import sys
+import json
+import shutil
+import subprocess
+from functools import lru_cache
+
+# 环境变量：直接指定字体文件，优先于自动查找
+FONT_ENV = "TECH_EVOLUTION_FONT"
+
+# 常见系统上的中文字体文件，按优先顺序排列，逐个检查是否存在
+KNOWN_FONTS = (
+    "C:/Windows/Fonts/msyh.ttc",  # 微软雅黑
+    "C:/Windows/Fonts/simhei.ttf",
+    "/System/Library/Fonts/PingFang.ttc",
+    "/System/Library/Fonts/STHeiti Medium.ttc",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",  # Debian / Ubuntu
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",  # Arch
+    "/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc",  # Fedora
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc",
+    "/usr/share/fonts/wenquanyi/wqy-microhei/wqy-microhei.ttc",
+    "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",
+)
+
+# 按文件名识别中文字体（小写子串），排在前面的优先
+CJK_NAME_HINTS = (
+    "msyh", "pingfang", "notosanscjk", "sourcehansans", "wqy-microhei", "wqy-zenhei",
+    "notoserifcjk", "simhei", "simsun", "droidsansfallback", "uming", "ukai",
+)
+
+# 常见路径都没有时逐个扫描的字体目录
+FONT_DIRS = (
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    "~/.local/share/fonts",
+    "~/.fonts",
+    "/Library/Fonts",
+    "~/Library/Fonts",
+)
+
+FONT_EXTENSIONS = (".ttf", ".ttc", ".otf", ".otc")
+
+
+def cache_file():
+    """保存查找结果的缓存文件"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "tech_evolution", "font.json")
+
+
+def _rank(path):
+    """字体文件的优先级，数值越小越优先；常规字重优先于粗体、细体"""
+    name = os.path.basename(path).lower()
+    rank = next((i for i, hint in enumerate(CJK_NAME_HINTS) if hint in name), len(CJK_NAME_HINTS))
+    weighted = any(w in name for w in ("bold", "black", "heavy", "medium", "light", "thin"))
+    return rank, weighted, path
+
+
+def _fontconfig_fonts():
+    """用 fontconfig 列出支持中文的字体文件，没有 fc-list 时返回空列表"""
+    if shutil.which("fc-list") is None:
+        return []
+    try:
+        result = subprocess.run(["fc-list", ":lang=zh", "file"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return []
+    # 每行形如 "/usr/share/fonts/.../wqy-microhei.ttc: "
+    return [line.split(":")[0].strip() for line in result.stdout.splitlines() if line.strip()]
+
+
+def _scan_fonts():
+    """在字体目录中按文件名找出中文字体"""
+    found = []
+    for directory in FONT_DIRS:
+        for root, _, files in os.walk(os.path.expanduser(directory)):
+            for name in files:
+                if name.lower().endswith(FONT_EXTENSIONS) and _rank(name)[0] < len(CJK_NAME_HINTS):
+                    found.append(os.path.join(root, name))
+    return found
+
+
+def discover():
+    """查找一个能显示中文的字体文件，找不到时返回 None"""
+    for path in KNOWN_FONTS:
+        if os.path.isfile(path):
+            return path
+    candidates = _fontconfig_fonts() or _scan_fonts()
+    return min(candidates, key=_rank) if candidates else None
+
+
+def _read_cache():
+    try:
+        with open(cache_file(), encoding="utf-8") as f:
+            path = json.load(f).get("path")
+    except (OSError, ValueError, AttributeError):
+        return None
+    # 字体被卸载后重新查找
+    return path if path and os.path.isfile(path) else None
+
+
+def _write_cache(path):
+    try:
+        os.makedirs(os.path.dirname(cache_file()), exist_ok=True)
+        with open(cache_file(), "w", encoding="utf-8") as f:
+            json.dump({"path": path}, f, ensure_ascii=False)
+    except OSError:
+        # 缓存目录不可写时只是下次启动需要重新查找
+        pass
+
+
+@lru_cache(maxsize=None)
+def font_path():
+    """返回能显示中文的字体文件路径，找不到时返回 None
+
+    依次使用环境变量 TECH_EVOLUTION_FONT、上次运行缓存在磁盘上的结果、常见路径、
+    fontconfig 和字体目录扫描。查找结果写入磁盘缓存，之后的启动只需确认文件还在。
+    """
+    path = os.environ.get(FONT_ENV)
+    if path and os.path.isfile(path):
+        return path
+    path = _read_cache()
+    if path is not None:
+        return path
+
+    path = discover()
+    if path is None:
+        print(f"警告：没有找到中文字体，中文将无法正常显示。请安装 Noto Sans CJK 或文泉驿字体，"
+              f"或用环境变量 {FONT_ENV} 指定字体文件", file=sys.stderr)
+    else:
+        _write_cache(path)
+    return path
+
+
+@lru_cache(maxsize=None)
+def load_font(size):
+    """按像素字号加载 pygame 字体，每个字号在第一次用到时才加载"""
+    import pygame
+
+    if not pygame.font.get_init():
+        pygame.font.init()
+    path = font_path()
+    if path is not None:
+        try:
+            return pygame.font.Font(path, size)
+        except (OSError, pygame.error) as e:
+            print(f"警告：无法加载字体 {path}：{e}", file=sys.stderr)
+    return pygame.font.Font(None, size)
+
+
+def configure_matplotlib():
+    """把中文字体注册到 matplotlib 并设为首选的无衬线字体，返回字体名称
+
+    找不到中文字体时不修改设置，返回 None。
+    """
+    from matplotlib import font_manager, rcParams
+
+    path = font_path()
+    if path is None:
+        return None
+    font_manager.fontManager.addfont(path)
+    name = font_manager.FontProperties(fname=path).get_name()
+    rcParams["font.family"] = "sans-serif"
+    rcParams["font.sans-serif"] = [name] + [f for f in rcParams["font.sans-serif"] if f != name]
+    return name
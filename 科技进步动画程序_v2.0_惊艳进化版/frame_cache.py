@@ -0,0 +1,284 @@
+"""预渲染帧缓存：把整段动画渲染一次写入文件，之后通过内存映射直接循环播放
+
+文件由固定长度的文件头、（压缩时）逐帧偏移表和帧数据组成，帧为原始 RGB 像素。
+不压缩（raw）时播放一帧只是把映射内存包装成表面再 blit，不复制、不模拟、不绘制；
+逐帧 zlib 压缩时每帧先解压再 blit，文件小两个数量级。
+文件头记录里程碑数据和渲染设置的哈希，任何一项变化都会使缓存失效并重新渲染。
+"""
+import os
+import sys
+import json
+import mmap
+import zlib
+import shutil
+import struct
+import hashlib
+
+import pygame
+
+from profiler import NULL_PROFILER
+from timestep import SIM_HZ
+from headless_render import render_frame, sequence_frame_count, surface_to_rgb
+
+MAGIC = b"TECHFRMS"
+# 文件格式或帧内容的生成方式变化时加一，旧缓存随之失效
+FORMAT_VERSION = 1
+CODECS = ("raw", "zlib")
+# 预渲染固定使用同一个随机种子，同样的设置总是得到同样的帧
+BAKE_SEED = 0
+
+# 魔数、格式版本、压缩方式、宽、高、帧数、帧率、设置哈希
+_HEADER = struct.Struct("<8sHHIIII32s")
+
+
+def cache_dir():
+    """默认保存帧缓存的目录"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "tech_evolution", "frames")
+
+
+def default_cache_path(name):
+    """动画版本 name 的默认帧缓存文件；每个版本只保留一个，设置变化时原地重新渲染"""
+    return os.path.join(cache_dir(), f"{name}.frames")
+
+
+def cache_key(milestones, **settings):
+    """里程碑数据与渲染设置的哈希"""
+    data = {"version": FORMAT_VERSION, "seed": BAKE_SEED, "milestones": milestones, "settings": settings}
+    text = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class FrameCacheWriter:
+    """逐帧写出帧缓存
+
+    先写入同目录下的临时文件，全部帧写完后 close() 才替换为正式文件；
+    中途出错或取消时调用 discard()，不会留下不完整的缓存。
+    """
+
+    def __init__(self, path, size, frames, fps, codec="raw", key=b""):
+        if codec not in CODECS:
+            raise ValueError(f"未知压缩方式: {codec}（可选 {', '.join(CODECS)}）")
+        self.path = path
+        self.size = size
+        self.frames = frames
+        self.codec = codec
+        self.written = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if codec == "raw":
+            # 不压缩时文件大小事先可知，空间不够就不必开始渲染
+            needed = _HEADER.size + frames * size[0] * size[1] * 3
+            free = shutil.disk_usage(os.path.dirname(os.path.abspath(path))).free
+            if needed > free:
+                raise OSError(f"磁盘空间不足：帧缓存需要 {needed / 2**30:.1f} GB，"
+                              f"剩余 {free / 2**30:.1f} GB，可以改用 zlib 压缩或降低帧率")
+        self._temp = path + ".tmp"
+        self.file = open(self._temp, "wb")
+        self.file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, CODECS.index(codec),
+                                     size[0], size[1], frames, fps, key))
+        self._offsets = None
+        if codec == "zlib":
+            # 偏移表先占位，写完全部帧后回填；第 i 帧位于 offsets[i] ~ offsets[i + 1]
+            self.file.write(bytes(8 * (frames + 1)))
+            self._offsets = [self.file.tell()]
+
+    def write(self, index, surface):
+        if index != self.written:
+            raise ValueError(f"帧缓存必须按顺序写入：期望第 {self.written} 帧，收到第 {index} 帧")
+        data = surface_to_rgb(surface)
+        if self._offsets is not None:
+            data = zlib.compress(data, 1)
+        self.file.write(data)
+        if self._offsets is not None:
+            self._offsets.append(self.file.tell())
+        self.written += 1
+
+    def close(self):
+        """写完全部帧后生效；帧数不足时视为未完成，丢弃临时文件"""
+        if self.written != self.frames:
+            self.discard()
+            return
+        if self._offsets is not None:
+            self.file.seek(_HEADER.size)
+            self.file.write(struct.pack(f"<{self.frames + 1}Q", *self._offsets))
+        self.file.close()
+        os.replace(self._temp, self.path)
+
+    def discard(self):
+        self.file.close()
+        if os.path.exists(self._temp):
+            os.remove(self._temp)
+
+
+class FrameCache:
+    """以只读内存映射打开的帧缓存
+
+    raw 缓存的 frame() 直接引用映射内存，由操作系统按需读入并缓存页面，
+    多次循环播放时常驻内存的部分无需再读磁盘。
+    """
+
+    def __init__(self, file, size, frames, fps, codec, offsets, data_start):
+        self.file = file
+        self.size = size
+        self.frames = frames
+        self.fps = fps
+        self.codec = codec
+        self._offsets = offsets
+        self._frame_bytes = size[0] * size[1] * 3
+        self._data_start = data_start
+        self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+    @classmethod
+    def open(cls, path, key=None):
+        """打开帧缓存；文件不存在、不完整或 key 不一致时返回 None"""
+        try:
+            file = open(path, "rb")
+        except OSError:
+            return None
+        try:
+            header = file.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(path)
+            magic, version, codec, width, height, frames, fps, stored_key = _HEADER.unpack(header)
+            if magic != MAGIC or version != FORMAT_VERSION or codec >= len(CODECS) or frames == 0:
+                raise ValueError(path)
+            if key is not None and stored_key != key:
+                raise ValueError(path)
+
+            file_size = os.fstat(file.fileno()).st_size
+            if CODECS[codec] == "zlib":
+                table = file.read(8 * (frames + 1))
+                if len(table) < 8 * (frames + 1):
+                    raise ValueError(path)
+                offsets = struct.unpack(f"<{frames + 1}Q", table)
+                expected = offsets[-1]
+            else:
+                offsets = None
+                expected = _HEADER.size + frames * width * height * 3
+            if file_size != expected:
+                raise ValueError(path)
+            return cls(file, (width, height), frames, fps, CODECS[codec], offsets, _HEADER.size)
+        except ValueError:
+            file.close()
+            return None
+
+    def frame(self, index):
+        """返回第 index 帧的表面；raw 缓存的表面直接引用映射内存，在 close() 之前有效"""
+        if self._offsets is not None:
+            data = zlib.decompress(self._view[self._offsets[index]:self._offsets[index + 1]])
+        else:
+            start = self._data_start + index * self._frame_bytes
+            data = self._view[start:start + self._frame_bytes]
+        return pygame.image.frombuffer(data, self.size, "RGB")
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+        self.file.close()
+
+
+class BakeProgress:
+    """预渲染时在窗口中显示刚渲染的帧和进度条，关闭窗口或按 ESC 取消"""
+
+    def __init__(self, screen, color=(255, 215, 0), interval=250):
+        self.screen = screen
+        self.color = color
+        self.interval = interval
+        self._last = None
+
+    def __call__(self, index, frames, surface):
+        """返回 False 表示取消"""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                return False
+        # 只按固定间隔刷新窗口，不拖慢渲染
+        now = pygame.time.get_ticks()
+        if self._last is not None and now - self._last < self.interval and index + 1 < frames:
+            return True
+        self._last = now
+        width, height = self.screen.get_size()
+        if surface.get_size() == (width, height):
+            self.screen.blit(surface, (0, 0))
+        else:
+            pygame.transform.smoothscale(surface, (width, height), self.screen)
+        self.screen.fill((0, 0, 0), (0, height - 8, width, 8))
+        self.screen.fill(self.color, (0, height - 8, width * (index + 1) // frames, 8))
+        pygame.display.flip()
+        return True
+
+
+def bake(path, animation, size, frames, fps, codec="raw", key=b"", progress=None):
+    """把动画的前 frames 帧按 size 分辨率渲染到帧缓存文件，返回是否完成
+
+    progress(index, frames, surface) 在每帧渲染后调用，返回 False 时取消并删除未完成的文件。
+    """
+    surface = pygame.Surface(size)
+    writer = FrameCacheWriter(path, size, frames, fps, codec, key)
+    try:
+        for index in range(frames):
+            render_frame(animation, surface, index, fps)
+            writer.write(index, surface)
+            if progress is not None and progress(index, frames, surface) is False:
+                break
+    except BaseException:
+        writer.discard()
+        raise
+    writer.close()
+    return writer.written == frames
+
+
+def load_or_bake(path, key, make_animation, size, milestone_count, fps, codec="raw", progress=None):
+    """打开与 key 一致的帧缓存，没有时调用 make_animation() 创建动画并重新渲染
+
+    取消渲染时返回 None。
+    """
+    cache = FrameCache.open(path, key)
+    if cache is not None:
+        return cache
+    frames = sequence_frame_count(milestone_count, fps)
+    print(f"正在预渲染 {frames} 帧到 {path}……", file=sys.stderr)
+    if not bake(path, make_animation(), size, frames, fps, codec, key, progress):
+        return None
+    return FrameCache.open(path, key)
+
+
+def play(screen, cache, seek_keys, start=0.0, profiler=NULL_PROFILER, hud=False):
+    """从帧缓存循环播放，直到关闭窗口或按 ESC
+
+    按墙钟时间决定当前帧，机器偶尔变慢时跳过帧而不是放慢播放；
+    空格键从头播放，P 键暂停，seek_keys 把按键映射为跳转的模拟步数。
+    """
+    clock = pygame.time.Clock()
+    position = start * cache.fps % cache.frames
+    paused = False
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key == pygame.K_SPACE:
+                    position = 0.0
+                elif event.key == pygame.K_p:
+                    paused = not paused
+                elif event.key in seek_keys:
+                    # 单步按键至少移动一帧
+                    steps = seek_keys[event.key]
+                    delta = steps * cache.fps / SIM_HZ
+                    if abs(delta) < 1:
+                        delta = 1 if steps > 0 else -1
+                    position = (int(position) + int(delta)) % cache.frames
+
+        frame_time = clock.tick(cache.fps) / 1000
+        profiler.begin_frame()
+        if not paused:
+            position = (position + frame_time * cache.fps) % cache.frames
+        with profiler.phase("playback"):
+            screen.blit(cache.frame(int(position)), (0, 0))
+        profiler.end_frame(frame=int(position))
+        if hud:
+            profiler.draw_hud(screen)
+        pygame.display.flip()
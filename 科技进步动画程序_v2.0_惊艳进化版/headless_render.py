@@ -0,0 +1,266 @@
+"""无窗口离线渲染：把 pygame 动画导出为 PNG 序列或原始 RGB 视频流
+
+用法示例：
+    python headless_render.py --png frames/
+    python headless_render.py --ffmpeg tech_evolution.mp4
+    python headless_render.py --raw - | ffmpeg -f rawvideo -pix_fmt rgb24 -s 1280x720 -r 60 -i - out.mp4
+    python headless_render.py --workers 32 --ffmpeg tech_evolution.mp4
+    python headless_render.py --start 1800 --frames 1 --png posters/
+"""
+import os
+import sys
+import time
+import argparse
+import importlib
+import shutil
+import tempfile
+import subprocess
+import multiprocessing
+from collections import deque
+
+import pygame
+
+from backend import init_pygame
+from timestep import SIM_HZ
+from layout import parse_size
+
+# 可导出的动画脚本
+SCRIPTS = {
+    "images": "tech_evolution_animation_with_images",
+    "basic": "tech_evolution_animation",
+}
+
+# 节点间隔 120 帧，全部激活后 180 帧出现结尾，透明度每帧 +3，再停留 2 秒
+NODE_INTERVAL = 120
+ENDING_DELAY = 180
+ENDING_FADE = 255 // 3
+ENDING_HOLD = 120
+
+
+def load_engine(script):
+    """导入指定的 pygame 动画脚本"""
+    return importlib.import_module(SCRIPTS[script])
+
+
+def sequence_frame_count(milestone_count, fps=SIM_HZ):
+    """以 fps 输出时，milestone_count 个里程碑完整播放一遍（含结尾）所需的帧数"""
+    steps = milestone_count * NODE_INTERVAL + ENDING_DELAY + ENDING_FADE + ENDING_HOLD
+    return -(-steps * fps // SIM_HZ)
+
+
+def default_frame_count(engine, fps=SIM_HZ):
+    """以 fps 输出时，完整播放一遍脚本内置的动画所需的帧数"""
+    return sequence_frame_count(len(engine.tech_milestones), fps)
+
+
+def surface_to_rgb(surface):
+    """取出表面的 RGB 字节"""
+    if hasattr(pygame.image, "tobytes"):
+        return pygame.image.tobytes(surface, "RGB")
+    return pygame.image.tostring(surface, "RGB")
+
+
+class PngSequenceWriter:
+    """把每一帧保存为编号的 PNG 文件"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, index, surface):
+        pygame.image.save(surface, os.path.join(self.directory, f"frame_{index:05d}.png"))
+
+    def close(self):
+        pass
+
+
+class RawPipeWriter:
+    """把原始 RGB 帧写入二进制流（标准输出、文件或编码器的标准输入）"""
+
+    def __init__(self, stream, process=None):
+        self.stream = stream
+        self.process = process
+
+    @classmethod
+    def open(cls, target):
+        if target == "-":
+            return cls(sys.stdout.buffer)
+        return cls(open(target, "wb"))
+
+    @classmethod
+    def ffmpeg(cls, output, width, height, fps):
+        """启动 ffmpeg 并把帧通过管道送给它编码"""
+        command = [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgb24",
+            "-s", f"{width}x{height}", "-r", str(fps),
+            "-i", "-",
+            "-pix_fmt", "yuv420p", output,
+        ]
+        process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        return cls(process.stdin, process)
+
+    def write(self, index, surface):
+        self.stream.write(surface_to_rgb(surface))
+
+    def close(self):
+        if self.stream is not sys.stdout.buffer:
+            self.stream.close()
+        else:
+            self.stream.flush()
+        if self.process is not None:
+            self.process.wait()
+
+
+def render(engine, writer, frames, seed=None, fps=SIM_HZ, size=None, first=0):
+    """从第 first 帧起尽可能快地逐帧推进并绘制 frames 帧，返回实际帧率"""
+    start = time.perf_counter()
+    render_range(engine, writer, first, first + frames, seed, fps, size)
+    elapsed = time.perf_counter() - start
+    return frames / elapsed if elapsed > 0 else float("inf")
+
+
+def render_frame(animation, surface, index, fps=SIM_HZ):
+    """把动画推进到输出的第 index 帧并绘制到 surface
+
+    模拟以固定的 SIM_HZ 步进，输出第 index 帧对应模拟时刻 (index + 1) * SIM_HZ / fps：
+    先推进整数步，再用小数部分插值绘制。每帧的状态只取决于帧号。
+    """
+    sim_time = (index + 1) * SIM_HZ / fps
+    steps = int(sim_time)
+    animation.advance_to(steps)
+    animation.draw(surface, sim_time - steps)
+
+
+def render_range(engine, writer, start, end, seed, fps=SIM_HZ, size=None):
+    """渲染 [start, end) 区间的帧，任意区间都能独立渲染
+
+    size 为输出分辨率，默认使用动画脚本的窗口大小。
+    """
+    # 不初始化显示模块，工作进程同样只需初始化字体
+    init_pygame("headless")
+    if size is None:
+        size = (engine.WIDTH, engine.HEIGHT)
+    surface = pygame.Surface(size)
+    animation = engine.TechEvolutionAnimation(seed=seed, size=size)
+
+    for index in range(start, end):
+        render_frame(animation, surface, index, fps)
+        writer.write(index, surface)
+
+
+def _render_chunk(task):
+    """进程池工作函数：渲染一个分块，返回分块文件路径（PNG 模式下为 None）"""
+    script, seed, fps, size, start, end, png_dir, chunk_dir = task
+    engine = load_engine(script)
+    if png_dir is not None:
+        writer = PngSequenceWriter(png_dir)
+        path = None
+    else:
+        path = os.path.join(chunk_dir, f"chunk_{start:06d}.rgb")
+        writer = RawPipeWriter(open(path, "wb"))
+    try:
+        render_range(engine, writer, start, end, seed, fps, size)
+    finally:
+        writer.close()
+    return path
+
+
+def split_frames(frames, chunk_size, first=0):
+    """把从第 first 帧开始的 frames 帧切分为连续的 (start, end) 分块"""
+    end = first + frames
+    return [(start, min(start + chunk_size, end)) for start in range(first, end, chunk_size)]
+
+
+def render_parallel(script, writer, frames, seed, workers, chunk_size, png_dir=None, fps=SIM_HZ, size=None,
+                    first=0, chunk_dir=None):
+    """用进程池并行渲染各分块，并按顺序拼接输出，返回实际帧率
+
+    PNG 模式下各进程直接按全局帧号写文件；原始帧模式下各进程先把分块写到 chunk_dir
+    （默认为系统临时目录）下的临时目录，主进程按时间顺序把分块依次送入 writer 后立即删除。
+    同一时刻最多有 workers 个分块在渲染或等待拼接，前面的分块拼接完才提交新的分块，
+    临时文件最多占用 workers * chunk_size 帧原始 RGB 的空间（4K 下每帧约 24 MB）。
+    """
+    temp_dir = None if png_dir is not None else tempfile.mkdtemp(prefix="tech_evolution_", dir=chunk_dir)
+    tasks = deque((script, seed, fps, size, start, end, png_dir, temp_dir)
+                  for start, end in split_frames(frames, chunk_size, first))
+
+    start = time.perf_counter()
+    try:
+        with multiprocessing.Pool(workers) as pool:
+            # 按提交顺序取结果，保证拼接顺序正确；每取走一个分块再补交一个
+            pending = deque()
+            while tasks or pending:
+                while tasks and len(pending) < workers:
+                    pending.append(pool.apply_async(_render_chunk, (tasks.popleft(),)))
+                path = pending.popleft().get()
+                if path is None:
+                    continue
+                with open(path, "rb") as chunk:
+                    shutil.copyfileobj(chunk, writer.stream)
+                os.remove(path)
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    elapsed = time.perf_counter() - start
+    return frames / elapsed if elapsed > 0 else float("inf")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="无窗口离线渲染科技进步动画")
+    parser.add_argument("--script", choices=sorted(SCRIPTS), default="images",
+                        help="要渲染的动画版本")
+    parser.add_argument("--frames", type=int, default=None,
+                        help="渲染帧数，默认完整播放一遍")
+    parser.add_argument("--start", type=int, default=0,
+                        help="从第几帧开始渲染（按输出帧率计），配合 --frames 1 导出单张海报画面")
+    parser.add_argument("--fps", type=int, default=SIM_HZ,
+                        help="输出视频的帧率，与模拟频率无关，动画时长保持不变")
+    parser.add_argument("--size", type=parse_size, default=None, metavar="WxH",
+                        help="输出分辨率（如 3840x2160），默认与窗口大小相同")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子，相同种子输出完全一致")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="并行渲染的进程数，0 表示使用全部 CPU 核心")
+    parser.add_argument("--chunk-size", type=int, default=120,
+                        help="并行渲染时每个分块的帧数")
+    parser.add_argument("--chunk-dir", metavar="DIR", default=None,
+                        help="并行渲染原始帧时存放分块临时文件的目录，默认为系统临时目录")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--png", metavar="DIR", help="输出 PNG 序列到目录")
+    output.add_argument("--raw", metavar="FILE", help="输出原始 RGB 帧到文件，'-' 表示标准输出")
+    output.add_argument("--ffmpeg", metavar="OUTPUT", help="通过管道交给 ffmpeg 编码为视频")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    engine = load_engine(args.script)
+    frames = args.frames if args.frames is not None else default_frame_count(engine, args.fps)
+    size = args.size or (engine.WIDTH, engine.HEIGHT)
+
+    if args.png:
+        writer = PngSequenceWriter(args.png)
+    elif args.raw:
+        writer = RawPipeWriter.open(args.raw)
+    else:
+        writer = RawPipeWriter.ffmpeg(args.ffmpeg, size[0], size[1], args.fps)
+
+    workers = args.workers or os.cpu_count() or 1
+    try:
+        if workers > 1:
+            fps = render_parallel(args.script, writer, frames, args.seed, workers,
+                                  args.chunk_size, png_dir=args.png, fps=args.fps, size=size,
+                                  first=args.start, chunk_dir=args.chunk_dir)
+        else:
+            fps = render(engine, writer, frames, seed=args.seed, fps=args.fps, size=size, first=args.start)
+    finally:
+        writer.close()
+
+    # 报告写到标准错误，避免污染 --raw - 的视频流
+    print(f"已渲染 {frames} 帧，平均 {fps:.1f} 帧/秒（实时的 {fps / args.fps:.1f} 倍）",
+          file=sys.stderr)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
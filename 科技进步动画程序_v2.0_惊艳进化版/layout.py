@@ -0,0 +1,120 @@
+from collections import deque
+
+# 设计坐标的高度：所有位置与尺寸都按高 720 的画面给出，宽度随屏幕宽高比变化
+DESIGN_HEIGHT = 720
+
+# 自动渲染缩放可选的档位，从原生分辨率逐级降低
+RENDER_SCALES = (1.0, 0.85, 0.75, 0.6, 0.5)
+
+
+def design_width(width, height):
+    """与 width x height 屏幕宽高比相同的设计坐标宽度"""
+    return width * DESIGN_HEIGHT / height
+
+
+class Layout:
+    """设计坐标到渲染像素的换算
+
+    scale 为每个设计单位对应的像素数（渲染表面高度 / 720）。同一套设计坐标可以在
+    720p 窗口、4K 大屏或降低分辨率的内部画布上绘制，只有换算结果不同。
+    字体按缩放后的字号通过 font_loader 加载并缓存。
+    """
+
+    def __init__(self, width, height, font_loader=None):
+        self.width = width
+        self.height = height
+        self.scale = height / DESIGN_HEIGHT
+        self.view_width = design_width(width, height)
+        self.font_loader = font_loader
+        self._fonts = {}
+
+    @property
+    def size(self):
+        return self.width, self.height
+
+    def px(self, value):
+        """把设计坐标换算为像素坐标"""
+        return int(round(value * self.scale))
+
+    def length(self, value, minimum=1):
+        """把设计尺寸（半径、线宽等）换算为像素，至少为 minimum"""
+        return max(minimum, int(round(value * self.scale)))
+
+    def point(self, x, y):
+        return self.px(x), self.px(y)
+
+    def font(self, design_size):
+        """返回设计字号对应的字体"""
+        font = self._fonts.get(design_size)
+        if font is None:
+            font = self._fonts[design_size] = self.font_loader(self.length(design_size))
+        return font
+
+
+def parse_size(text):
+    """解析 "1920x1080" 形式的分辨率"""
+    width, height = (int(v) for v in text.lower().split("x"))
+    if width <= 0 or height <= 0:
+        raise ValueError(text)
+    return width, height
+
+
+def parse_render_scale(text):
+    """解析渲染缩放：0~1 之间的小数，或 "auto" 表示自动选择"""
+    if text == "auto":
+        return text
+    scale = float(text)
+    if not 0 < scale <= 1:
+        raise ValueError(text)
+    return scale
+
+
+def render_size(width, height, render_scale):
+    """按渲染缩放计算内部画布的尺寸"""
+    return max(1, int(round(width * render_scale))), max(1, int(round(height * render_scale)))
+
+
+class RenderScaler:
+    """按实际帧耗时自动选择渲染缩放
+
+    统计最近 window 帧的平均工作耗时（模拟 + 绘制 + 放大，不含等待垂直同步的时间）。
+    超过帧预算的 high 比例时降低一档；低于 low 比例、并且已经稳定 cooldown 帧时才回升一档，
+    两个阈值之间留出余量，避免在两档之间来回切换。
+    """
+
+    def __init__(self, target_fps, scales=RENDER_SCALES, window=30, high=0.9, low=0.6, cooldown=120):
+        self.budget = 1.0 / target_fps if target_fps > 0 else 1.0 / 60
+        self.scales = scales
+        self.level = 0
+        self.high = high
+        self.low = low
+        self.cooldown = cooldown
+        self.samples = deque(maxlen=window)
+        self._stable = 0
+
+    @property
+    def scale(self):
+        return self.scales[self.level]
+
+    def record(self, work_time):
+        """记录一帧的工作耗时（秒），档位变化时返回 True"""
+        self.samples.append(work_time)
+        if len(self.samples) < self.samples.maxlen:
+            return False
+        average = sum(self.samples) / len(self.samples)
+
+        if average > self.budget * self.high and self.level < len(self.scales) - 1:
+            self.level += 1
+        elif average < self.budget * self.low and self.level > 0:
+            self._stable += 1
+            if self._stable < self.cooldown:
+                return False
+            self.level -= 1
+        else:
+            self._stable = 0
+            return False
+
+        # 换档后重新积累样本
+        self._stable = 0
+        self.samples.clear()
+        return True
@@ -0,0 +1,191 @@
+"""matplotlib 版本的流式导出：逐帧渲染到 Agg 画布，直接写入 ffmpeg 管道或 GIF 文件
+
+与 FuncAnimation.save 不同，这里不重绘整张图、也不在内存中积攒帧：静态部分只绘制一次，
+之后每帧恢复背景并只重绘动画返回的图形对象（blitting），再把 Agg 画布的像素缓冲区
+（buffer_rgba，不复制）交给写出器。内存占用与导出帧数无关。
+
+用法示例：
+    python matplotlib_export.py --gif tech_evolution.gif
+    python matplotlib_export.py --ffmpeg tech_evolution.mp4 --frames 6000
+    python matplotlib_export.py --raw - | ffmpeg -f rawvideo -pix_fmt rgba -s 1600x900 -r 20 -i - out.mp4
+"""
+import sys
+import time
+import argparse
+import subprocess
+
+import matplotlib
+
+# 必须在导入 pyplot 之前选择 Agg 后端，无需显示器
+matplotlib.use("Agg")
+
+from PIL import Image, ImageChops, GifImagePlugin
+
+import tech_evolution_matplotlib as script
+
+
+def render_frames(fig, animate, frames):
+    """依次生成第 0 ~ frames-1 帧的 RGBA 像素缓冲区
+
+    animate(frame) 返回本帧变化的图形对象。第一次调用后把它们标记为 animated，
+    画布只绘制一次其余的静态部分并保存为背景；之后每帧先恢复背景，
+    再按 zorder 重绘这些对象。返回的 memoryview 直接指向画布的缓冲区，
+    下一帧绘制时会被覆盖，写出器需要在取下一帧之前用完。
+    """
+    canvas = fig.canvas
+    artists = animate(0)
+    for artist in artists:
+        artist.set_animated(True)
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+
+    for frame in range(frames):
+        if frame > 0:
+            artists = animate(frame)
+        canvas.restore_region(background)
+        for artist in sorted(artists, key=lambda a: a.get_zorder()):
+            fig.draw_artist(artist)
+        yield canvas.buffer_rgba()
+
+
+class RgbaPipeWriter:
+    """把原始 RGBA 帧写入二进制流（标准输出、文件或编码器的标准输入）"""
+
+    def __init__(self, stream, process=None):
+        self.stream = stream
+        self.process = process
+
+    @classmethod
+    def open(cls, target):
+        if target == "-":
+            return cls(sys.stdout.buffer)
+        return cls(open(target, "wb"))
+
+    @classmethod
+    def ffmpeg(cls, output, width, height, fps):
+        """启动 ffmpeg 并把帧通过管道送给它编码"""
+        command = [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgba",
+            "-s", f"{width}x{height}", "-r", str(fps),
+            "-i", "-",
+            # yuv420p 要求宽高为偶数
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-pix_fmt", "yuv420p", output,
+        ]
+        process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        return cls(process.stdin, process)
+
+    def write(self, index, buffer):
+        self.stream.write(buffer)
+
+    def close(self):
+        if self.stream is not sys.stdout.buffer:
+            self.stream.close()
+        else:
+            self.stream.flush()
+        if self.process is not None:
+            self.process.wait()
+
+
+class GifStreamWriter:
+    """逐帧写出的 GIF 编码器
+
+    第一帧量化出 colors 色的全局调色板，之后每帧按同一调色板映射（不抖动），
+    只写出与上一帧不同的矩形区域。任何时刻只保留上一帧的索引图像。
+    """
+
+    def __init__(self, path, width, height, fps, colors=256, loop=0):
+        self.file = open(path, "wb")
+        self.size = (width, height)
+        # GIF 的帧间隔以 1/100 秒为单位
+        self.duration = max(2, round(100 / fps)) * 10
+        self.colors = colors
+        self.loop = loop
+        self.palette = None
+        self.previous = None
+
+    def _quantize(self, buffer):
+        frame = Image.frombuffer("RGBA", self.size, buffer, "raw", "RGBA", 0, 1).convert("RGB")
+        if self.palette is None:
+            self.palette = frame.quantize(self.colors, dither=Image.Dither.NONE)
+            return self.palette
+        return frame.quantize(palette=self.palette, dither=Image.Dither.NONE)
+
+    def write(self, index, buffer):
+        frame = self._quantize(buffer)
+        if self.previous is None:
+            header, _ = GifImagePlugin.getheader(frame, info={"loop": self.loop, "duration": self.duration})
+            self.file.write(b"".join(header))
+            box = (0, 0) + self.size
+        else:
+            # 与上一帧相同时仍写出一个像素，保证帧间隔不变
+            box = ImageChops.difference(frame, self.previous).getbbox() or (0, 0, 1, 1)
+        # disposal=1：保留上一帧，只覆盖变化的区域
+        for chunk in GifImagePlugin.getdata(frame.crop(box), box[:2], duration=self.duration, disposal=1):
+            self.file.write(chunk)
+        self.previous = frame
+
+    def close(self):
+        self.file.write(b";")
+        self.file.close()
+
+
+def export(fig, animate, writer, frames):
+    """流式渲染 frames 帧并写出，返回实际帧率"""
+    start = time.perf_counter()
+    for index, buffer in enumerate(render_frames(fig, animate, frames)):
+        writer.write(index, buffer)
+    elapsed = time.perf_counter() - start
+    return frames / elapsed if elapsed > 0 else float("inf")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="流式导出 matplotlib 版本的科技进步动画")
+    parser.add_argument("--frames", type=int, default=None,
+                        help="导出帧数，默认一遍动画（300 帧）；可以远超一遍，内存占用不变")
+    parser.add_argument("--fps", type=float, default=None,
+                        help="输出帧率，默认与窗口播放相同（20）")
+    parser.add_argument("--dpi", type=float, default=None,
+                        help="渲染分辨率（每英寸像素数），画面为 16x9 英寸，默认 100 即 1600x900")
+    parser.add_argument("--particles", type=int, default=script.PARTICLE_COUNT,
+                        help=f"背景粒子数量（默认 {script.PARTICLE_COUNT}）")
+    parser.add_argument("--colors", type=int, default=256, help="GIF 调色板颜色数（2~256）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子，相同种子输出完全一致")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--gif", metavar="FILE", help="输出 GIF 动画")
+    output.add_argument("--raw", metavar="FILE", help="输出原始 RGBA 帧到文件，'-' 表示标准输出")
+    output.add_argument("--ffmpeg", metavar="OUTPUT", help="通过管道交给 ffmpeg 编码为视频")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    fig, animate = script.build_animation(particle_count=args.particles, seed=args.seed)
+    frames = args.frames if args.frames is not None else script.FRAMES
+    fps = args.fps if args.fps is not None else 1000 / script.INTERVAL
+
+    if args.dpi is not None:
+        fig.set_dpi(args.dpi)
+    # 与窗口播放时相同的布局
+    fig.tight_layout()
+    width, height = fig.canvas.get_width_height(physical=True)
+
+    if args.gif:
+        writer = GifStreamWriter(args.gif, width, height, fps, colors=args.colors)
+    elif args.raw:
+        writer = RgbaPipeWriter.open(args.raw)
+    else:
+        writer = RgbaPipeWriter.ffmpeg(args.ffmpeg, width, height, fps)
+
+    try:
+        rate = export(fig, animate, writer, frames)
+    finally:
+        writer.close()
+
+    # 报告写到标准错误，避免污染 --raw - 的视频流
+    print(f"已导出 {frames} 帧（{width}x{height}），平均 {rate:.1f} 帧/秒", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import re
+import csv
+import json
+
+import numpy as np
+
+# 时间轴默认占据的屏幕范围（与内置里程碑的 x 坐标一致）
+TIMELINE_LEFT = 100
+TIMELINE_RIGHT = 1180
+
+_CENTURY = re.compile(r"^(公元前|前)?\s*(\d+)\s*世纪$")
+_DECADE = re.compile(r"^(\d+)\s*(s|年代)$")
+# 负号只能单独使用，不能跟在“公元前”等前缀之后
+_YEAR = re.compile(r"^(?:(公元前|前|公元)\s*|(-))?(\d+(?:\.\d+)?)\s*年?$")
+
+
+def parse_year(value):
+    """把年份描述转换为数值年份
+
+    支持 105、"1041"、"1769年"、"公元前221年"、"9世纪"（取世纪中点 850）、
+    "2020s" / "2020年代"（取年代中点 2025）等写法。
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    text = str(value).strip()
+    match = _CENTURY.match(text)
+    if match:
+        century = int(match.group(2))
+        middle = (century - 1) * 100 + 50
+        return -float(middle) if match.group(1) else float(middle)
+
+    match = _DECADE.match(text)
+    if match:
+        return float(match.group(1)) + 5
+
+    match = _YEAR.match(text)
+    if match:
+        year = float(match.group(3))
+        return -year if match.group(1) in ("公元前", "前") or match.group(2) else year
+
+    raise ValueError(f"无法识别的年份: {value!r}")
+
+
+def _read_records(path):
+    if path.lower().endswith(".csv"):
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            return list(csv.DictReader(f))
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("milestones", [])
+    return data
+
+
+def layout_timeline(milestones, left=TIMELINE_LEFT, right=TIMELINE_RIGHT, pixels_per_year=None):
+    """按年份把里程碑映射到时间轴的 x 坐标，返回按 x 排序的新列表
+
+    默认把最早与最晚的年份拉伸到 [left, right]；指定 pixels_per_year 时按固定比例展开，
+    时间轴可以远远超出屏幕宽度。
+    """
+    items = [dict(m, year_value=parse_year(m["year"])) for m in milestones]
+    if not items:
+        return items
+    items.sort(key=lambda m: m["year_value"])
+
+    first = items[0]["year_value"]
+    last = items[-1]["year_value"]
+    if pixels_per_year is None:
+        pixels_per_year = (right - left) / (last - first) if last > first else 0
+    for item in items:
+        item["x"] = left + (item["year_value"] - first) * pixels_per_year
+    return items
+
+
+def load_milestones(path, left=TIMELINE_LEFT, right=TIMELINE_RIGHT, pixels_per_year=None):
+    """从 JSON 或 CSV 文件加载里程碑
+
+    每条记录至少包含 name 和 year，可选 era、icon；x 坐标由年份自动计算。
+    JSON 文件可以是记录列表，也可以是 {"milestones": [...]}。
+    """
+    records = []
+    for record in _read_records(path):
+        records.append({
+            "name": str(record["name"]),
+            "year": str(record["year"]),
+            "era": str(record.get("era") or ""),
+            "icon": record.get("icon") or None,
+        })
+    return layout_timeline(records, left, right, pixels_per_year)
+
+
+class MilestoneIndex:
+    """按 x 坐标排序的里程碑索引
+
+    用二分查找取出与视口相交的节点区间，并把过于密集的节点聚合为细节层次（LOD）标记，
+    每帧的开销只与可见节点数有关，而与数据集的总规模无关。
+    """
+
+    def __init__(self, xs):
+        self.xs = np.asarray(xs, dtype=np.float64)
+        if len(self.xs) > 1 and np.any(np.diff(self.xs) < 0):
+            raise ValueError("里程碑必须按 x 坐标排序")
+
+    def __len__(self):
+        return len(self.xs)
+
+    def visible(self, left, right):
+        """返回 x 落在 [left, right] 内的节点下标区间 (lo, hi)"""
+        lo = int(np.searchsorted(self.xs, left, side="left"))
+        hi = int(np.searchsorted(self.xs, right, side="right"))
+        return lo, hi
+
+    def clusters(self, lo, hi, cell):
+        """把 [lo, hi) 内的节点按世界坐标网格分组
+
+        返回 (start, end) 列表；同一网格单元中的节点归为一组，
+        只有一个节点的组按原样绘制，多个节点的组绘制为聚合标记。
+        网格对齐世界坐标，镜头平移时分组保持稳定。
+        """
+        if hi <= lo:
+            return []
+        cells = np.floor(self.xs[lo:hi] / cell).astype(np.int64)
+        # 网格编号单调不减，边界就是编号变化的位置
+        breaks = np.flatnonzero(np.diff(cells)) + 1
+        starts = np.concatenate(([0], breaks)) + lo
+        ends = np.concatenate((breaks, [hi - lo])) + lo
+        return list(zip(starts.tolist(), ends.tolist()))
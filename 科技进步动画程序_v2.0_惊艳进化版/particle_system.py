@@ -0,0 +1,159 @@
+import pygame
+import numpy as np
+
+from sprite_cache import draw_dots, scaled_radius
+
+# 粒子寿命（帧）与阻尼系数，与原先逐对象的 Particle 保持一致
+PARTICLE_LIFE = 100
+PARTICLE_DAMPING = 0.98
+PARTICLE_MAX_RADIUS = 3
+PARTICLE_SPEED = 2
+
+
+def grid_rects(px, py, margin, cell=64):
+    """返回覆盖全部点 (px, py) 的粗粒度网格矩形，margin 为点的半径上限（不超过 cell）"""
+    if len(px) == 0:
+        return []
+    # 取每个点外接框四角所在的网格并去重
+    left, right = (px - margin) // cell, (px + margin) // cell
+    top, bottom = (py - margin) // cell, (py + margin) // cell
+    cx = np.concatenate((left, left, right, right))
+    cy = np.concatenate((top, bottom, top, bottom))
+    cells = np.unique(np.stack((cx, cy), axis=1), axis=0)
+    return [pygame.Rect(x * cell, y * cell, cell, cell) for x, y in cells.tolist()]
+
+
+class ParticleSystem:
+    """共享的爆发粒子系统
+
+    所有粒子以结构数组（x, y, vx, vy, life, color）的形式存放在 NumPy 数组中，
+    每帧只做一次批量的发射、积分、阻尼与剔除，绘制时使用预渲染精灵批量 blit。
+    """
+
+    def __init__(self, palette, capacity=1024, rng=None):
+        self.palette = list(palette)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.vx = np.zeros(capacity, dtype=np.float64)
+        self.vy = np.zeros(capacity, dtype=np.float64)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros(capacity, dtype=np.uint8)
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        old = (self.x, self.y, self.vx, self.vy, self.life, self.color)
+        n = self.count
+        self._allocate(capacity)
+        for new_arr, old_arr in zip((self.x, self.y, self.vx, self.vy, self.life, self.color), old):
+            new_arr[:n] = old_arr[:n]
+
+    def emit(self, x, y, count):
+        """在 (x, y) 处爆发 count 个粒子"""
+        if count <= 0:
+            return
+        start = self.count
+        end = start + count
+        if end > self.capacity:
+            self._grow(end)
+
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = self.rng.uniform(-PARTICLE_SPEED, PARTICLE_SPEED, count)
+        self.vy[start:end] = self.rng.uniform(-PARTICLE_SPEED, PARTICLE_SPEED, count)
+        self.life[start:end] = PARTICLE_LIFE
+        self.color[start:end] = self.rng.integers(0, len(self.palette), count)
+        self.count = end
+
+    def update(self):
+        n = self.count
+        if n == 0:
+            return
+
+        # 积分与阻尼
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.life[:n] -= 1
+        self.vx[:n] *= PARTICLE_DAMPING
+        self.vy[:n] *= PARTICLE_DAMPING
+
+        # 剔除寿命耗尽的粒子，并把存活粒子压缩到数组前部
+        alive = self.life[:n] > 0
+        remaining = int(np.count_nonzero(alive))
+        if remaining != n:
+            for arr in (self.x, self.y, self.vx, self.vy, self.life, self.color):
+                arr[:remaining] = arr[:n][alive]
+            self.count = remaining
+
+    def snapshot(self):
+        """返回全部存活粒子状态的副本，供 restore() 恢复"""
+        n = self.count
+        return tuple(arr[:n].copy() for arr in (self.x, self.y, self.vx, self.vy, self.life, self.color))
+
+    def restore(self, state):
+        n = len(state[0])
+        # 先清空，扩容时无需复制旧粒子
+        self.count = 0
+        if n > self.capacity:
+            self._grow(n)
+        for arr, saved in zip((self.x, self.y, self.vx, self.vy, self.life, self.color), state):
+            arr[:n] = saved
+        self.count = n
+
+    def _positions(self, offset_x, interp, scale):
+        """绘制位置：按插值系数沿速度方向前推，减去镜头偏移后换算为像素"""
+        n = self.count
+        px = ((self.x[:n] + self.vx[:n] * interp - offset_x) * scale).astype(np.int32)
+        py = ((self.y[:n] + self.vy[:n] * interp) * scale).astype(np.int32)
+        return px, py
+
+    def dirty_rects(self, offset_x=0, interp=0.0, scale=1.0, cell=64):
+        """返回覆盖全部粒子的粗粒度网格矩形，用于脏矩形刷新"""
+        if self.count == 0:
+            return []
+        px, py = self._positions(offset_x, interp, scale)
+        return grid_rects(px, py, scaled_radius(PARTICLE_MAX_RADIUS, scale), cell)
+
+    def draw(self, surface, offset_x=0, interp=0.0, scale=1.0):
+        """绘制全部粒子
+
+        offset_x 为镜头在世界坐标中的水平偏移，interp 为两次模拟步之间的插值系数，
+        scale 为每个设计单位对应的像素数。
+        """
+        n = self.count
+        if n == 0:
+            return
+
+        px, py = self._positions(offset_x, interp, scale)
+
+        # 剔除视口之外的粒子
+        margin = scaled_radius(PARTICLE_MAX_RADIUS, scale)
+        onscreen = (px >= -margin) & (px < surface.get_width() + margin)
+        if not onscreen.all():
+            px = px[onscreen]
+            py = py[onscreen]
+            life = self.life[:n][onscreen]
+            color = self.color[:n][onscreen]
+        else:
+            life = self.life[:n]
+            color = self.color[:n]
+
+        # 半径随寿命线性衰减
+        radius = (PARTICLE_MAX_RADIUS * life) // PARTICLE_LIFE
+
+        for r in range(1, PARTICLE_MAX_RADIUS + 1):
+            ring = radius == r
+            if not ring.any():
+                continue
+            for c in range(len(self.palette)):
+                mask = ring & (color == c)
+                if not mask.any():
+                    continue
+                draw_dots(surface, px[mask], py[mask], scaled_radius(r, scale), self.palette[c])
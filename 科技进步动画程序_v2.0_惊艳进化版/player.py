@@ -0,0 +1,189 @@
+"""pygame 动画的交互播放：命令行参数、实时播放循环与预渲染播放
+
+两个动画版本共用同一套播放逻辑，各自的 main() 只是以自己的模块调用 main(engine, name)。
+engine 模块需提供 TechEvolutionAnimation、tech_milestones、WIDTH、HEIGHT、CAPTION 与 STAR_COUNT。
+"""
+import time
+import argparse
+
+import pygame
+
+from profiler import FrameProfiler, NULL_PROFILER
+from timestep import FixedTimestep, SIM_HZ
+from timeline import Timeline
+from milestone_data import load_milestones
+from layout import render_size, parse_size, parse_render_scale
+from quality import QUALITY_LEVELS, QualityGovernor, governor_levels, parse_quality
+from backend import init_pygame, open_display
+from headless_render import sequence_frame_count
+from frame_cache import BAKE_SEED, CODECS, BakeProgress, cache_key, default_cache_path, load_or_bake, play
+
+# 播放时的跳转按键与跳转的模拟步数
+SEEK_KEYS = {
+    pygame.K_LEFT: -5 * SIM_HZ,
+    pygame.K_RIGHT: 5 * SIM_HZ,
+    pygame.K_COMMA: -1,
+    pygame.K_PERIOD: 1,
+}
+
+
+def play_baked(engine, name, args, screen, milestones, profiler):
+    """预渲染模式：打开（必要时先渲染）帧缓存并循环播放"""
+    window_size = screen.get_size()
+    # 预渲染不受实时帧预算限制，auto 时使用最高特效
+    quality = QUALITY_LEVELS[0] if args.quality == "auto" else args.quality
+    key = cache_key(milestones, script=name, size=window_size, fps=args.fps,
+                    stars=args.stars, quality=quality.name, codec=args.bake_codec)
+
+    def make_animation():
+        animation = engine.TechEvolutionAnimation(seed=BAKE_SEED, milestones=milestones,
+                                                  star_count=args.stars, size=window_size)
+        animation.set_quality(quality)
+        return animation
+
+    path = args.bake or default_cache_path(name)
+    cache = load_or_bake(path, key, make_animation, window_size, len(milestones), args.fps,
+                         args.bake_codec, BakeProgress(screen))
+    if cache is None:
+        return
+    try:
+        play(screen, cache, SEEK_KEYS, start=args.start, profiler=profiler, hud=args.hud)
+    finally:
+        cache.close()
+
+
+def parse_args(engine, argv=None):
+    parser = argparse.ArgumentParser(description="人类科技进步动画")
+    parser.add_argument("--data", metavar="FILE", help="从 JSON/CSV 文件加载里程碑")
+    parser.add_argument("--px-per-year", type=float, default=None,
+                        help="每年对应的像素数，默认把全部里程碑铺满时间轴")
+    parser.add_argument("--fps", type=int, default=60,
+                        help="目标帧率（如 30/60/120/144），模拟速度与帧率无关")
+    parser.add_argument("--size", type=parse_size, default=(engine.WIDTH, engine.HEIGHT), metavar="WxH",
+                        help=f"窗口大小（默认 {engine.WIDTH}x{engine.HEIGHT}），如 3840x2160")
+    parser.add_argument("--fullscreen", action="store_true", help="以桌面分辨率全屏显示")
+    parser.add_argument("--backend", choices=("display", "offscreen"), default="display",
+                        help="display 打开窗口；offscreen 不显示窗口地运行，用于自动化测试")
+    parser.add_argument("--render-scale", type=parse_render_scale, default=1.0,
+                        help="内部渲染分辨率与窗口分辨率之比（0~1），auto 表示按 --fps 自动选择")
+    parser.add_argument("--quality", type=parse_quality, default="auto",
+                        help="特效质量（high/medium/low/minimal），默认 auto 表示帧耗时超出预算时自动降低、恢复后回升")
+    parser.add_argument("--stars", type=int, default=engine.STAR_COUNT,
+                        help=f"背景星空的星星数量（默认 {engine.STAR_COUNT}）")
+    parser.add_argument("--dirty", action="store_true",
+                        help="脏矩形模式：只刷新变化的区域，适合低功耗设备")
+    parser.add_argument("--hud", action="store_true",
+                        help="在屏幕上显示逐阶段帧耗时与对象数量")
+    parser.add_argument("--profile-out", metavar="FILE",
+                        help="退出时把性能统计写入 FILE（.json 汇总或 .csv 逐帧）")
+    parser.add_argument("--start", type=float, default=0.0, metavar="SECONDS",
+                        help="从动画的第几秒开始播放")
+    parser.add_argument("--bake", nargs="?", const="", default=None, metavar="FILE",
+                        help="预渲染模式：整段动画只渲染一次写入帧缓存文件（默认在用户缓存目录），"
+                             "之后直接从文件循环播放；里程碑或设置变化时自动重新渲染")
+    parser.add_argument("--bake-codec", choices=CODECS, default="raw",
+                        help="帧缓存的压缩方式：raw 播放开销最小但文件很大，zlib 逐帧压缩")
+    return parser.parse_args(argv)
+
+
+def main(engine, name, argv=None):
+    """以 engine 模块中的动画运行交互播放，name 为动画版本名（"basic" 或 "images"），用于区分帧缓存"""
+    args = parse_args(engine, argv)
+    milestones = engine.tech_milestones
+    if args.data:
+        milestones = load_milestones(args.data, pixels_per_year=args.px_per_year)
+
+    init_pygame(args.backend)
+    screen = open_display(args.size, args.fullscreen, engine.CAPTION)
+    window_size = screen.get_size()
+
+    # 特效质量与渲染缩放排成一条档位序列，按实际帧耗时自动升降；
+    # 低于 1 的渲染缩放先画到较小的内部画布，再平滑放大到窗口；脏矩形模式总是原生分辨率绘制
+    levels = governor_levels(args.quality, 1.0 if args.dirty else args.render_scale)
+    governor = QualityGovernor(args.fps, levels) if len(levels) > 1 else None
+    quality, render_scale = levels[0]
+    canvas = None
+
+    clock = pygame.time.Clock()
+    timestep = FixedTimestep()
+    profiler = FrameProfiler() if args.hud or args.profile_out else NULL_PROFILER
+    if args.bake is not None:
+        play_baked(engine, name, args, screen, milestones, profiler)
+        if args.profile_out:
+            profiler.dump(args.profile_out)
+        pygame.quit()
+        return
+
+    animation = engine.TechEvolutionAnimation(milestones=milestones, star_count=args.stars, size=window_size)
+    animation.profiler = profiler
+    animation.set_quality(quality)
+    # 时间线记录检查点，拖动和跳转时不必从头重放；完整播放一遍以内的检查点一直保留，
+    # 之后只保留最近的若干个，长时间循环展示时内存不再增长
+    timeline = Timeline(animation, keep_until=sequence_frame_count(len(milestones)))
+    timeline.seek(args.start * SIM_HZ)
+    paused = False
+    running = True
+
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key == pygame.K_SPACE:
+                    # 重置动画
+                    timeline.seek(0)
+                    animation.set_quality(quality)
+                    timestep.reset()
+                elif event.key == pygame.K_p:
+                    paused = not paused
+                elif event.key in SEEK_KEYS:
+                    # 左右方向键前后跳转，逗号/句号逐步微调（适合暂停后选取画面）
+                    timeline.seek(timeline.frame + SEEK_KEYS[event.key])
+                    # 检查点恢复的是记录时的特效质量，之后按当前档位继续播放
+                    animation.set_quality(quality)
+                    timestep.reset()
+
+        # 按实际经过的时间执行固定步长的模拟
+        frame_time = clock.tick(args.fps) / 1000
+        work_start = time.perf_counter()
+        profiler.begin_frame()
+        steps = timestep.advance(frame_time)
+        if paused:
+            timestep.reset()
+        else:
+            for _ in range(steps):
+                timeline.step()
+
+        # 在两次模拟步之间插值绘制
+        if args.dirty:
+            rects = animation.draw_dirty(screen, timestep.interp)
+        elif render_scale < 1:
+            size = render_size(*window_size, render_scale)
+            if canvas is None or canvas.get_size() != size:
+                canvas = pygame.Surface(size)
+            animation.draw(canvas, timestep.interp)
+            pygame.transform.smoothscale(canvas, window_size, screen)
+        else:
+            animation.draw(screen, timestep.interp)
+        profiler.end_frame(**animation.object_counts())
+
+        # 按本帧的工作耗时调整特效质量与渲染缩放
+        if governor is not None and governor.record(time.perf_counter() - work_start):
+            quality, render_scale = governor.current
+            animation.set_quality(quality)
+
+        # 更新显示；脏矩形模式下统计面板所在区域在下一帧由静态层恢复
+        hud_rect = profiler.draw_hud(screen) if args.hud else None
+        if args.dirty:
+            if hud_rect is not None:
+                rects.append(hud_rect)
+                animation.scene.dirty_rects.append(hud_rect)
+            pygame.display.update(rects)
+        else:
+            pygame.display.flip()
+
+    if args.profile_out:
+        profiler.dump(args.profile_out)
+    pygame.quit()
@@ -0,0 +1,145 @@
+import csv
+import json
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+import pygame
+
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    """逐阶段的帧耗时统计
+
+    每帧由 begin_frame() / end_frame() 包围，期间用 phase(name) 计时各个阶段；
+    保留最近 window 帧的数据，计算 p50/p95/p99，并记录粒子、数据流等对象数量。
+    """
+
+    def __init__(self, window=600):
+        self.window = window
+        self.frame_times = deque(maxlen=window)
+        self.phase_times = {}
+        self.counts = {}
+        self.peak_counts = {}
+        self.frame_count = 0
+        self._frame_start = None
+        self._current = {}
+        self._hud = None
+        self._hud_font = None
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._current[name] = self._current.get(name, 0.0) + time.perf_counter() - start
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+        self._current = {}
+
+    def end_frame(self, **counts):
+        """结束一帧，counts 为本帧的对象数量（如 particles=1200）"""
+        if self._frame_start is None:
+            return
+        self.frame_times.append((time.perf_counter() - self._frame_start) * 1000)
+        # 本帧未出现的阶段记为 0，保证各阶段序列与帧序列对齐
+        for name in set(self.phase_times) | set(self._current):
+            times = self.phase_times.get(name)
+            if times is None:
+                times = self.phase_times[name] = deque([0.0] * (len(self.frame_times) - 1), maxlen=self.window)
+            times.append(self._current.get(name, 0.0) * 1000)
+        for name, value in counts.items():
+            self.counts[name] = value
+            self.peak_counts[name] = max(self.peak_counts.get(name, 0), value)
+        self.frame_count += 1
+        self._frame_start = None
+
+    @staticmethod
+    def _stats(values):
+        data = np.fromiter(values, dtype=np.float64)
+        if data.size == 0:
+            return {}
+        stats = {f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(data, PERCENTILES))}
+        stats["mean"] = float(data.mean())
+        stats["max"] = float(data.max())
+        return stats
+
+    def summary(self):
+        """返回滚动窗口内的统计结果（毫秒）"""
+        return {
+            "frames": self.frame_count,
+            "window": len(self.frame_times),
+            "frame_ms": self._stats(self.frame_times),
+            "phases_ms": {name: self._stats(times) for name, times in sorted(self.phase_times.items())},
+            "counts": dict(self.counts),
+            "peak_counts": dict(self.peak_counts),
+        }
+
+    def dump(self, path):
+        """导出统计结果：.csv 为窗口内逐帧数据，其他扩展名为 JSON 汇总"""
+        if path.lower().endswith(".csv"):
+            names = sorted(self.phase_times)
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame", "frame_ms"] + [f"{name}_ms" for name in names])
+                first = self.frame_count - len(self.frame_times)
+                columns = [self.phase_times[name] for name in names]
+                for i, total in enumerate(self.frame_times):
+                    writer.writerow([first + i, f"{total:.3f}"] + [f"{col[i]:.3f}" for col in columns])
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+    def draw_hud(self, surface, refresh=15):
+        """在左上角绘制统计面板，每 refresh 帧重新排版一次，返回绘制区域"""
+        if self._hud is None or self.frame_count % refresh == 0:
+            self._hud = self._render_hud()
+        if self._hud is None:
+            return None
+        return surface.blit(self._hud, (10, 10))
+
+    def _render_hud(self):
+        if not self.frame_times:
+            return None
+        if self._hud_font is None:
+            self._hud_font = pygame.font.Font(None, 20)
+
+        frame = self._stats(self.frame_times)
+        lines = [f"frame  p50 {frame['p50']:.2f}  p95 {frame['p95']:.2f}  p99 {frame['p99']:.2f} ms"]
+        for name, times in sorted(self.phase_times.items()):
+            stats = self._stats(times)
+            lines.append(f"{name:<12} p50 {stats['p50']:.2f}  p95 {stats['p95']:.2f}")
+        lines.append("  ".join(f"{name} {value}" for name, value in self.counts.items()))
+
+        rendered = [self._hud_font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(text.get_width() for text in rendered) + 12
+        height = sum(text.get_height() for text in rendered) + 12
+        hud = pygame.Surface((width, height), pygame.SRCALPHA)
+        hud.fill((0, 0, 0, 160))
+        y = 6
+        for text in rendered:
+            hud.blit(text, (6, y))
+            y += text.get_height()
+        return hud
+
+
+class NullProfiler:
+    """不做任何统计的占位实现，未开启性能分析时使用"""
+
+    _null = nullcontext()
+
+    def phase(self, name):
+        return self._null
+
+    def begin_frame(self):
+        pass
+
+    def end_frame(self, **counts):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
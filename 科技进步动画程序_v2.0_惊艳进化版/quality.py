@@ -0,0 +1,71 @@
+from data_flow import TRAIL_POINTS
+from layout import RENDER_SCALES, RenderScaler
+
+
+class Quality:
+    """一个特效质量档位
+
+    amount 为爆发粒子、背景星星和结尾火花数量相对默认值的比例，
+    glow_rings 为节点光晕的圆环数，trail_points 为每条数据流绘制的尾迹点数。
+    """
+
+    def __init__(self, name, amount, glow_rings, trail_points):
+        self.name = name
+        self.amount = amount
+        self.glow_rings = glow_rings
+        self.trail_points = trail_points
+
+    def count(self, value):
+        """按比例缩减数量，原本非零的数量至少保留 1 个"""
+        if value <= 0:
+            return 0
+        return max(1, int(round(value * self.amount)))
+
+
+# 特效质量档位，从高到低；high 与原先的效果完全相同，
+# 尾迹点数按实际绘制的点数逐档减少，至少保留 1 个
+QUALITY_LEVELS = (
+    Quality("high", 1.0, 5, TRAIL_POINTS),
+    Quality("medium", 0.6, 4, max(1, TRAIL_POINTS - 1)),
+    Quality("low", 0.35, 3, max(1, TRAIL_POINTS - 2)),
+    Quality("minimal", 0.15, 2, 1),
+)
+QUALITIES = {quality.name: quality for quality in QUALITY_LEVELS}
+
+
+def parse_quality(text):
+    """解析特效质量：档位名称，或 "auto" 表示自动选择"""
+    if text == "auto":
+        return text
+    if text not in QUALITIES:
+        raise ValueError(text)
+    return QUALITIES[text]
+
+
+def governor_levels(quality, render_scale):
+    """把特效质量与渲染缩放排成一条从高到低的档位序列，元素为 (质量, 渲染缩放)
+
+    两者都为 auto 时先逐档降低特效，降到最低后再降低渲染分辨率；恢复时顺序相反。
+    固定的一方在所有档位中保持不变。
+    """
+    qualities = QUALITY_LEVELS if quality == "auto" else (quality,)
+    scales = RENDER_SCALES if render_scale == "auto" else (render_scale,)
+    levels = [(q, scales[0]) for q in qualities]
+    levels += [(qualities[-1], scale) for scale in scales[1:]]
+    return levels
+
+
+class QualityGovernor(RenderScaler):
+    """按实际帧耗时在特效质量与渲染缩放的档位之间切换
+
+    换档规则与 RenderScaler 相同，只是每一档由 governor_levels() 给出的 (质量, 渲染缩放) 组成，
+    scale 仍为当前档位的渲染缩放。
+    """
+
+    def __init__(self, target_fps, levels, **kwargs):
+        super().__init__(target_fps, [scale for _, scale in levels], **kwargs)
+        self.levels = levels
+
+    @property
+    def current(self):
+        return self.levels[self.level]
@@ -0,0 +1,184 @@
+import numpy as np
+import pygame
+
+from profiler import NULL_PROFILER
+
+
+class CachedLayer:
+    """缓存在单独表面上的图层
+
+    key() 返回决定图层内容的全部输入（如已激活的节点数、分辨率），bounds() 返回图层
+    在目标表面上的矩形。key 或矩形尺寸变化时图层变脏，refresh() 调用 render(surface)
+    重绘缓存表面并把 version 加一；矩形只移动位置时无需重绘。
+    给出 colorkey 时图层以该颜色为透明色键，并用 RLE 加速，blit 时直接跳过透明的部分；
+    色键图层适合没有半透明像素的内容（如连接线），与直接绘制在画面上的结果相同。
+    否则图层带逐像素透明度（如抗锯齿的文字），不开启 RLE：RLE 加速的透明度混合与普通 blit 相差 ±1。
+    """
+
+    def __init__(self, name, render, key, bounds, colorkey=None):
+        self.name = name
+        self.render = render
+        self.key = key
+        self.bounds = bounds
+        self.colorkey = colorkey
+        self.surface = None
+        self.rect = None
+        self.version = 0
+        self._key = None
+
+    def refresh(self):
+        """按需重绘缓存表面，返回图层与上次合成时相比是否重绘或移动"""
+        rect = self.bounds()
+        key = self.key()
+        moved = rect != self.rect
+        self.rect = rect
+        if self.surface is not None and self.surface.get_size() == rect.size and key == self._key:
+            return moved
+
+        # 每次重绘都换一张新表面：RLE 加速过的表面即使关闭加速，之后在上面绘制的结果也与新表面不同；
+        # 绘制完成后才开启加速，否则每次绘制解锁表面时都要重新编码
+        if self.colorkey is None:
+            surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+            self.render(surface)
+        else:
+            surface = pygame.Surface(rect.size)
+            surface.fill(self.colorkey)
+            self.render(surface)
+            surface.set_colorkey(self.colorkey, pygame.RLEACCEL)
+        self.surface = surface
+        self._key = key
+        self.version += 1
+        return True
+
+    def restore(self, surface, rect):
+        """把缓存内容中与 rect 相交的部分重新合成到目标表面"""
+        clip = rect.clip(self.rect)
+        if clip.width and clip.height:
+            surface.blit(self.surface, clip, clip.move(-self.rect.x, -self.rect.y))
+
+
+class DynamicLayer:
+    """每帧重绘的图层
+
+    draw(surface) 绘制本帧内容；rects() 返回本帧将要绘制的区域，在绘制之前调用，
+    供脏矩形模式确定需要重新合成的范围，必须覆盖 draw() 实际绘制的全部像素。
+    """
+
+    def __init__(self, name, draw, rects):
+        self.name = name
+        self.draw = draw
+        self.rects = rects
+
+
+def disjoint_rects(rects, bounds, cell=16):
+    """把可能互相重叠的矩形合并为互不重叠、按 cell 对齐的矩形列表
+
+    结果覆盖全部输入矩形（裁剪到 bounds 之内），每个像素最多属于一个矩形。
+    先把矩形标记到 cell 大小的网格上，再按行取连续的格子，上下相邻且左右边界相同的行段合并为一个矩形。
+    """
+    cols = -(-bounds.width // cell)
+    rows = -(-bounds.height // cell)
+    mask = np.zeros((rows, cols), dtype=bool)
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if rect.width and rect.height:
+            mask[(rect.top - bounds.y) // cell:(rect.bottom - bounds.y - 1) // cell + 1,
+                 (rect.left - bounds.x) // cell:(rect.right - bounds.x - 1) // cell + 1] = True
+
+    result = []
+    # 上一行各行段 (起始列, 结束列) 对应的矩形，下一行出现相同的行段时向下延伸
+    open_runs = {}
+    for row in range(rows):
+        edges = np.flatnonzero(np.diff(np.concatenate(([False], mask[row], [False]))))
+        runs = {}
+        for start, end in zip(edges[::2].tolist(), edges[1::2].tolist()):
+            rect = open_runs.get((start, end))
+            if rect is None:
+                rect = pygame.Rect(bounds.x + start * cell, bounds.y + row * cell, (end - start) * cell, cell)
+                result.append(rect)
+            else:
+                rect.height += cell
+            runs[start, end] = rect
+        open_runs = runs
+    return [rect.clip(bounds) for rect in result]
+
+
+class Scene:
+    """保留模式的场景
+
+    画面先填充底色 background，再按 layers 的顺序从下到上合成。缓存图层（CachedLayer）只在输入变化时重绘，
+    之后每帧只需一次 blit；动态图层（DynamicLayer）每帧重绘。两种图层可以任意交错，
+    标题这类位于动态内容之上的缓存图层放在动态图层之后即可。
+    draw() 合成整帧；draw_dirty() 只在上一帧与本帧动态图层所在的区域内按同样的顺序重新合成，
+    缓存图层重绘或移动时才整屏重绘，两种方式的画面相同。
+    """
+
+    def __init__(self, background, layers, cell=16):
+        self.background = background
+        self.layers = layers
+        self.static = [layer for layer in layers if isinstance(layer, CachedLayer)]
+        self.dynamic = [layer for layer in layers if isinstance(layer, DynamicLayer)]
+        # 脏区域对齐的网格大小
+        self.cell = cell
+        # 上一帧动态图层的区域；叠加在画面上的其他内容（如统计面板）也可以追加进来，下一帧一并恢复
+        self.dirty_rects = []
+        self._valid = False
+
+    def invalidate(self):
+        """下次 draw_dirty() 整屏重绘"""
+        self._valid = False
+
+    def refresh(self, profiler=NULL_PROFILER):
+        """按需重绘全部缓存图层，返回是否有图层重绘或移动；各图层的耗时计入以图层名命名的阶段"""
+        changed = False
+        for layer in self.static:
+            with profiler.phase(layer.name):
+                changed = layer.refresh() or changed
+        return changed
+
+    def _composite(self, surface, region, profiler):
+        """按图层顺序合成；region 为互不重叠的矩形列表，为 None 时合成整个表面
+
+        填充底色计入 "static" 阶段，每个图层的合成计入以图层名命名的阶段。
+        """
+        with profiler.phase("static"):
+            if region is None:
+                surface.fill(self.background)
+            else:
+                for rect in region:
+                    surface.fill(self.background, rect)
+        for layer in self.layers:
+            with profiler.phase(layer.name):
+                if isinstance(layer, DynamicLayer):
+                    # 动态图层只绘制在自己的区域内，这些区域都已包含在 region 中
+                    layer.draw(surface)
+                elif region is None:
+                    surface.blit(layer.surface, layer.rect)
+                else:
+                    for rect in region:
+                        layer.restore(surface, rect)
+
+    def draw(self, surface, profiler=NULL_PROFILER):
+        self.refresh(profiler)
+        self._composite(surface, None, profiler)
+        # 整帧重绘后不再跟踪动态区域
+        self.invalidate()
+
+    def draw_dirty(self, surface, profiler=NULL_PROFILER):
+        """脏矩形模式绘制，返回需要刷新到屏幕的矩形列表
+
+        上一帧与本帧的动态区域合并为互不重叠的区域，区域内先填充底色，再按图层顺序恢复缓存图层、
+        重绘动态图层；区域外的像素与上一帧相同，不必重绘。
+        """
+        screen_rect = surface.get_rect()
+        full = self.refresh(profiler) or not self._valid
+        rects = []
+        for layer in self.dynamic:
+            with profiler.phase(layer.name):
+                rects.extend(rect.clip(screen_rect) for rect in layer.rects())
+        with profiler.phase("static"):
+            region = None if full else disjoint_rects(self.dirty_rects + rects, screen_rect, self.cell)
+        self._composite(surface, region, profiler)
+        self.dirty_rects = rects
+        self._valid = True
+        return [screen_rect] if full else region
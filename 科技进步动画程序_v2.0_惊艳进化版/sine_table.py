@@ -0,0 +1,44 @@
+import math
+
+import numpy as np
+
+# 查找表的采样点数（一个周期），相邻采样点相差约 0.0015 弧度，远小于一个像素
+TABLE_SIZE = 4096
+
+
+class SineTable:
+    """预先计算的正弦查找表
+
+    标量与 NumPy 数组都可以查表：标量走 Python 列表下标，数组一次 take 完成，
+    时间轴波浪、节点脉动和结尾火花共用同一张表，逐点绘制不再调用 math.sin。
+    """
+
+    def __init__(self, size=TABLE_SIZE):
+        self.size = size
+        self.scale = size / (2 * math.pi)
+        self.table = np.sin(np.arange(size) * (2 * math.pi / size))
+        self._list = self.table.tolist()
+
+    def sin(self, x):
+        if isinstance(x, np.ndarray):
+            index = np.rint(x * self.scale).astype(np.int64) % self.size
+            return self.table.take(index)
+        return self._list[int(round(x * self.scale)) % self.size]
+
+    def cos(self, x):
+        # cos(x) = sin(x + π/2)
+        return self.sin(x + math.pi / 2)
+
+
+SINE = SineTable()
+
+
+def wave(left, right, spacing, phase, amplitude, frequency):
+    """沿 x 轴每隔 spacing 取一个点生成正弦波
+
+    采样点对齐 spacing 的整数倍，返回 (xs, offsets)：xs 为 [left, right) 内的采样 x 坐标，
+    offsets 为 amplitude * sin(phase + frequency * x)。
+    """
+    xs = np.arange(left - left % spacing, right, spacing)
+    return xs, amplitude * SINE.sin(phase + frequency * xs)
+
@@ -0,0 +1,94 @@
+from functools import lru_cache
+
+import pygame
+
+# 透明色键，用于不需要逐像素透明度的精灵
+COLORKEY = (255, 0, 255)
+
+
+class GlowSpriteCache:
+    """节点光晕精灵缓存
+
+    光晕由若干条颜色交替的同心圆环组成，半径随脉动变化。
+    按量化后的整数基准半径预渲染整组圆环，绘制时只需一次 blit。
+    """
+
+    def __init__(self, colors, rings=5, spacing=5, radii=(), width=1):
+        self.colors = list(colors)
+        self.rings = rings
+        self.spacing = spacing
+        self.width = width
+        self._sprites = {}
+        # 预先渲染已知的半径范围，避免运行中分配表面
+        for radius in radii:
+            self.get(radius)
+
+    def get(self, base_radius):
+        base_radius = int(base_radius)
+        sprite = self._sprites.get(base_radius)
+        if sprite is None:
+            outer = base_radius + (self.rings - 1) * self.spacing
+            sprite = pygame.Surface((outer * 2, outer * 2))
+            sprite.fill(COLORKEY)
+            sprite.set_colorkey(COLORKEY)
+            for i in range(self.rings):
+                color = self.colors[i % len(self.colors)]
+                pygame.draw.circle(sprite, color, (outer, outer), base_radius + i * self.spacing, self.width)
+            self._sprites[base_radius] = (sprite, outer)
+        return self._sprites[base_radius]
+
+    def draw(self, surface, x, y, base_radius):
+        """以 (x, y) 为圆心绘制光晕"""
+        sprite, outer = self.get(base_radius)
+        return surface.blit(sprite, (int(x) - outer, int(y) - outer))
+
+
+@lru_cache(maxsize=None)
+def circle_sprite(radius, color, canvas_size):
+    """返回画在透明画布中心的实心圆精灵，color 可以带透明度"""
+    sprite = pygame.Surface((canvas_size, canvas_size), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, color, (canvas_size // 2, canvas_size // 2), radius)
+    return sprite
+
+
+def scaled_radius(radius, scale):
+    """按渲染缩放换算圆点半径，至少为 1 像素"""
+    return max(1, int(round(radius * scale)))
+
+
+@lru_cache(maxsize=None)
+def dot_sprite(radius, color):
+    """返回直径 2 * radius 的色键实心圆点精灵，用于粒子、数据流等大量小圆点的批量 blit"""
+    sprite = pygame.Surface((radius * 2, radius * 2))
+    sprite.fill(COLORKEY)
+    sprite.set_colorkey(COLORKEY)
+    pygame.draw.circle(sprite, color, (radius, radius), radius)
+    return sprite
+
+
+def draw_dots(surface, xs, ys, radius, color):
+    """以 (xs[i], ys[i]) 为圆心批量绘制同色同半径的圆点
+
+    半径为 1 的圆点（2x2 像素）直接写入表面像素数组，其余半径用预渲染精灵批量 blit。
+    """
+    if radius == 1:
+        try:
+            pixels = pygame.surfarray.pixels2d(surface)
+        except ValueError:
+            # 24 位等不支持直接访问的表面改用精灵
+            pixels = None
+        if pixels is not None:
+            clip = surface.get_clip()
+            value = surface.map_rgb(color)
+            for dx in (-1, 0):
+                for dy in (-1, 0):
+                    px = xs + dx
+                    py = ys + dy
+                    inside = (px >= clip.left) & (px < clip.right) & (py >= clip.top) & (py < clip.bottom)
+                    pixels[px[inside], py[inside]] = value
+            del pixels
+            return
+
+    sprite = dot_sprite(radius, color)
+    positions = zip((xs - radius).tolist(), (ys - radius).tolist())
+    surface.blits([(sprite, pos) for pos in positions], False)
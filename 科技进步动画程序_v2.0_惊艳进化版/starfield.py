@@ -0,0 +1,107 @@
+import numpy as np
+
+from particle_system import grid_rects
+from sprite_cache import draw_dots, scaled_radius
+
+# 视差层：(视差系数, 最低速度, 最高速度, 星点半径, 数量占比)
+# 视差系数越小越“远”，随镜头平移得越少，漂移也越慢、星点越小
+STAR_LAYERS = (
+    (0.1, 0.1, 0.2, 1, 0.6),
+    (0.3, 0.2, 0.35, 2, 0.3),
+    (0.6, 0.35, 0.5, 3, 0.1),
+)
+STAR_MAX_RADIUS = max(layer[3] for layer in STAR_LAYERS)
+
+# 黄金分割比的小数部分，用于把星星均匀地排出绘制顺序
+_GOLDEN = 0.6180339887498949
+
+
+class Starfield:
+    """分层视差星空背景
+
+    星星的位置、速度与所在层存放在 NumPy 数组中，每步一次批量漂移并回绕。
+    半径为 1 的远景星直接写入表面像素数组，较大的星点用预渲染精灵批量 blit，
+    上万颗星也只有与层数相关的 Python 开销。
+    density 为实际绘制的星星比例，负载高时可以减少；被跳过的星星照常漂移。
+    """
+
+    def __init__(self, width, height, count, color, layers=STAR_LAYERS, rng=None):
+        self.width = width
+        self.height = height
+        self.color = color
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        # 按占比把星星分配到各层，余数归入第一层
+        weights = np.array([layer[4] for layer in layers])
+        sizes = np.floor(count * weights / weights.sum()).astype(np.int64)
+        sizes[0] += count - sizes.sum()
+        self.layer = np.repeat(np.arange(len(layers)), sizes)
+        self.parallax = np.array([layer[0] for layer in layers])[self.layer]
+        self.radius = np.array([layer[3] for layer in layers], dtype=np.int32)[self.layer]
+        low = np.array([layer[1] for layer in layers])[self.layer]
+        high = np.array([layer[2] for layer in layers])[self.layer]
+
+        self.count = count
+        self.x = self.rng.uniform(0, width, count)
+        self.y = self.rng.integers(0, height, count)
+        self.speed = self.rng.uniform(low, high)
+
+        # 按 rank < density 选出要绘制的星星，低差异序列使各层、各处的星星同比例减少
+        self.density = 1.0
+        self._rank = (np.arange(count) * _GOLDEN) % 1
+
+    def __len__(self):
+        return self.count
+
+    def update(self):
+        if self.count == 0:
+            return
+        self.x += self.speed
+        # 漂出右边缘的星星回到左边缘，并换一个高度
+        wrapped = self.x > self.width
+        if wrapped.any():
+            self.x[wrapped] -= self.width
+            self.y[wrapped] = self.rng.integers(0, self.height, int(np.count_nonzero(wrapped)))
+
+    def snapshot(self):
+        """返回星星位置的副本（速度与所在层不会变化），供 restore() 恢复"""
+        return self.x.copy(), self.y.copy()
+
+    def restore(self, state):
+        self.x[:], self.y[:] = state
+
+    def _positions(self, offset_x, interp, scale):
+        """返回要绘制的星星的像素坐标与半径
+
+        按插值系数前推，按视差系数减去镜头偏移并在屏幕宽度内回绕，再换算为像素。
+        """
+        x, y, speed, parallax, radius = self.x, self.y, self.speed, self.parallax, self.radius
+        if self.density < 1:
+            shown = self._rank < self.density
+            x, y, speed, parallax, radius = x[shown], y[shown], speed[shown], parallax[shown], radius[shown]
+        px = np.mod(x + speed * interp - offset_x * parallax, self.width) * scale
+        return px.astype(np.int32), (y * scale).astype(np.int32), radius
+
+    def dirty_rects(self, offset_x=0, interp=0.0, scale=1.0, cell=16):
+        """返回覆盖全部星星的网格矩形，用于脏矩形刷新
+
+        星点小而稀疏，默认使用较细的网格，避免大片刷新没有变化的区域。
+        """
+        if self.count == 0:
+            return []
+        px, py, _ = self._positions(offset_x, interp, scale)
+        return grid_rects(px, py, scaled_radius(STAR_MAX_RADIUS, scale), cell)
+
+    def draw(self, surface, offset_x=0, interp=0.0, scale=1.0):
+        """绘制全部星星
+
+        offset_x 为镜头在世界坐标中的水平偏移，interp 为两次模拟步之间的插值系数，
+        scale 为每个设计单位对应的像素数。
+        """
+        if self.count == 0:
+            return
+        px, py, radius = self._positions(offset_x, interp, scale)
+
+        for r in np.unique(radius).tolist():
+            mask = radius == r
+            draw_dots(surface, px[mask], py[mask], scaled_radius(r, scale), self.color)
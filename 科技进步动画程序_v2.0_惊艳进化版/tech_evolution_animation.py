@@ -1,17 +1,30 @@
+import sys
 import pygame
 import math
-import random
 import numpy as np
 from datetime import datetime
+from functools import lru_cache
+from particle_system import ParticleSystem
+from data_flow import DataFlowField
+from starfield import Starfield
+from sine_table import SINE, wave
+from profiler import NULL_PROFILER
+from text_cache import text_cache
+from camera import Camera
+from milestone_data import MilestoneIndex
+from layout import DESIGN_HEIGHT, Layout, design_width
+from quality import QUALITY_LEVELS
+from fonts import load_font
+from scene import CachedLayer, DynamicLayer, Scene
+import player
+from sprite_cache import draw_dots, GlowSpriteCache
 
-# 初始化Pygame
-pygame.init()
+# 导入本模块不会初始化 pygame 或打开窗口，由 main() 或导出工具通过 backend 选择后端
 
-# 设置窗口大小
+# 默认窗口大小（可用 --size / --fullscreen 修改）
 WIDTH = 1280
 HEIGHT = 720
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("人类科技进步 - 从四大发明到人工智能")
+CAPTION = "人类科技进步 - 从四大发明到人工智能"
 
 # 定义颜色
 DEEP_BLUE = (0, 20, 60)
@@ -20,17 +33,43 @@ LIGHT_BLUE = (100, 149, 237)
 WHITE = (255, 255, 255)
 DARK_GOLD = (184, 134, 11)
 
-# 字体设置
-try:
-    font_path = "C:/Windows/Fonts/msyh.ttc"  # 微软雅黑字体路径
-    title_font = pygame.font.Font(font_path, 48)
-    subtitle_font = pygame.font.Font(font_path, 32)
-    text_font = pygame.font.Font(font_path, 24)
-except:
-    # 如果找不到中文字体，使用默认字体
-    title_font = pygame.font.Font(None, 48)
-    subtitle_font = pygame.font.Font(None, 32)
-    text_font = pygame.font.Font(None, 24)
+# 字体设置：字号为设计坐标下的大小，绘制时按渲染缩放换算；
+# 中文字体由 fonts 模块查找，每个字号第一次用到时才加载
+TITLE_SIZE = 48
+SUBTITLE_SIZE = 32
+TEXT_SIZE = 24
+
+# 时间轴在设计坐标中的高度
+TIMELINE_Y = DESIGN_HEIGHT // 2
+
+# 节点激活时爆发的粒子数量
+PARTICLE_BURST = 20
+
+# 每条连接线上同时流动的数据流数量
+FLOWS_PER_CONNECTION = 3
+
+# 同时存在的数据流上限，超出后循环复用最早的数据流
+MAX_DATA_FLOWS = 4096
+
+# 背景星空的星星数量
+STAR_COUNT = 50
+
+# 时间轴装饰波浪的采样间距（设计坐标），取 2 即可得到连续平滑的波浪
+WAVE_SPACING = 50
+WAVE_AMPLITUDE = 5
+
+# 视口两侧额外更新和绘制的边距（节点图标与文字的半宽）
+NODE_MARGIN = 100
+
+# 时间轴两端到首尾节点的边距
+TIMELINE_MARGIN = 100
+
+# 细节层次网格宽度，同一格内的多个节点聚合为一个标记
+LOD_CELL = 60
+
+# 静态世界层缓存为比视口宽的条带，左边缘按视口宽度的这一比例对齐；
+# 镜头在条带内平移时只移动条带的位置，越过对齐网格时才重绘
+WORLD_STRIP_STEP = 0.25
 
 # 科技里程碑
 tech_milestones = [
@@ -44,141 +83,130 @@ tech_milestones = [
     {"name": "人工智能", "year": "2020s", "era": "智能时代", "x": 1000}
 ]
 
-class Particle:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.vx = random.uniform(-2, 2)
-        self.vy = random.uniform(-2, 2)
-        self.life = 100
-        self.color = GOLD if random.random() > 0.5 else LIGHT_BLUE
-        
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.life -= 1
-        self.vx *= 0.98
-        self.vy *= 0.98
-        
-    def draw(self, surface):
-        alpha = self.life / 100
-        radius = int(3 * alpha)
-        if radius > 0:
-            pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), radius)
-
-class DataFlow:
-    def __init__(self, start_x, start_y, end_x, end_y):
-        self.start_x = start_x
-        self.start_y = start_y
-        self.end_x = end_x
-        self.end_y = end_y
-        self.progress = 0
-        self.speed = random.uniform(0.01, 0.03)
-        self.color = GOLD if random.random() > 0.5 else LIGHT_BLUE
-        
-    def update(self):
-        self.progress += self.speed
-        if self.progress > 1:
-            self.progress = 0
-            
-    def draw(self, surface):
-        if self.progress > 0:
-            current_x = self.start_x + (self.end_x - self.start_x) * self.progress
-            current_y = self.start_y + (self.end_y - self.start_y) * self.progress
-            
-            # 绘制流动的点
-            pygame.draw.circle(surface, self.color, (int(current_x), int(current_y)), 3)
-            
-            # 绘制轨迹
-            alpha = 1 - self.progress
-            for i in range(5):
-                trail_progress = self.progress - i * 0.05
-                if trail_progress > 0:
-                    trail_x = self.start_x + (self.end_x - self.start_x) * trail_progress
-                    trail_y = self.start_y + (self.end_y - self.start_y) * trail_progress
-                    radius = int(2 * (1 - i/5))
-                    if radius > 0:
-                        pygame.draw.circle(surface, self.color, (int(trail_x), int(trail_y)), radius)
+@lru_cache(maxsize=8)
+def glow_sprites(scale, rings=5):
+    """节点光晕精灵，按渲染缩放和圆环数预渲染脉动范围内的全部半径"""
+    return GlowSpriteCache((GOLD, LIGHT_BLUE), rings=rings, spacing=max(1, round(5 * scale)),
+                           radii=range(int(10 * scale), int(30 * scale) + 1),
+                           width=max(1, round(scale)))
 
 class TechNode:
-    def __init__(self, milestone, index):
+    def __init__(self, milestone, index, particle_system):
         self.milestone = milestone
         self.x = milestone["x"]
-        self.y = HEIGHT // 2
+        self.y = TIMELINE_Y
         self.radius = 20
         self.pulse = 0
         self.active = False
         self.index = index
-        self.particles = []
+        self.particle_system = particle_system
         
-    def activate(self):
+    def activate(self, burst=PARTICLE_BURST):
         self.active = True
         # 创建爆发粒子效果
-        for _ in range(20):
-            self.particles.append(Particle(self.x, self.y))
+        self.particle_system.emit(self.x, self.y, burst)
             
     def update(self):
         if self.active:
             self.pulse = (self.pulse + 0.1) % (2 * math.pi)
             
-        # 更新粒子
-        self.particles = [p for p in self.particles if p.life > 0]
-        for particle in self.particles:
-            particle.update()
-            
-    def draw(self, surface):
+    def labels(self, layout, x):
+        """返回激活后显示的名称和年份文字表面及其位置"""
+        name_text = text_cache.render(layout.font(TEXT_SIZE), self.milestone["name"], WHITE)
+        year_text = text_cache.render(layout.font(TEXT_SIZE), self.milestone["year"], GOLD)
+        return [
+            (name_text, name_text.get_rect(center=(x, layout.px(self.y - 40)))),
+            (year_text, year_text.get_rect(center=(x, layout.px(self.y + 40)))),
+        ]
+    
+    def bounds(self, layout, offset_x=0, glow_rings=5):
+        """返回 draw() 可能绘制的区域（光晕按脉动的最大半径计算），用于在绘制之前确定脏矩形"""
+        x = layout.px(self.x - offset_x)
+        y = layout.px(self.y)
+        half = layout.length(self.radius) + 1
+        if self.active:
+            _, outer = glow_sprites(layout.scale, glow_rings).get((self.radius + 10) * layout.scale)
+            half = max(half, outer)
+        rect = pygame.Rect(x - half, y - half, half * 2, half * 2)
+        if self.active:
+            rect.unionall_ip([label for _, label in self.labels(layout, x)])
+        return rect
+    
+    def draw(self, surface, layout, offset_x=0, interp=0.0, glow_rings=5):
+        x = layout.px(self.x - offset_x)
+        y = layout.px(self.y)
+        
         # 绘制节点光晕
         if self.active:
-            glow_radius = self.radius + 10 * math.sin(self.pulse)
-            for i in range(5):
-                alpha = 50 - i * 10
-                glow_color = (*GOLD, alpha) if i % 2 == 0 else (*LIGHT_BLUE, alpha)
-                pygame.draw.circle(surface, glow_color[:3], (int(self.x), int(self.y)), 
-                                 int(glow_radius + i * 5), 1)
+            glow_radius = self.radius + 10 * SINE.sin(self.pulse + 0.1 * interp)
+            glow_sprites(layout.scale, glow_rings).draw(surface, x, y, glow_radius * layout.scale)
         
         # 绘制节点
         color = GOLD if self.active else DARK_GOLD
-        pygame.draw.circle(surface, color, (int(self.x), int(self.y)), self.radius)
-        pygame.draw.circle(surface, WHITE, (int(self.x), int(self.y)), self.radius, 2)
-        
-        # 绘制粒子
-        for particle in self.particles:
-            particle.draw(surface)
+        radius = layout.length(self.radius)
+        pygame.draw.circle(surface, color, (x, y), radius)
+        pygame.draw.circle(surface, WHITE, (x, y), radius, layout.length(2))
         
         # 绘制文字
         if self.active:
-            name_text = text_font.render(self.milestone["name"], True, WHITE)
-            name_rect = name_text.get_rect(center=(self.x, self.y - 40))
-            surface.blit(name_text, name_rect)
-            
-            year_text = text_font.render(self.milestone["year"], True, GOLD)
-            year_rect = year_text.get_rect(center=(self.x, self.y + 40))
-            surface.blit(year_text, year_rect)
+            for text, rect in self.labels(layout, x):
+                surface.blit(text, rect)
 
 class TechEvolutionAnimation:
-    def __init__(self):
-        self.nodes = [TechNode(m, i) for i, m in enumerate(tech_milestones)]
+    def __init__(self, seed=None, milestones=None, star_count=None, size=None):
+        # 指定 seed 时动画完全可复现，便于离线导出时按帧重建状态
+        rng = np.random.default_rng(seed)
+        self.rng = rng
+        self.particle_system = ParticleSystem((GOLD, LIGHT_BLUE), rng=rng)
+        if milestones is None:
+            milestones = tech_milestones
+        # 节点按 x 排序，便于按视口二分查找
+        milestones = sorted(milestones, key=lambda m: m["x"])
+        self.nodes = [TechNode(m, i, self.particle_system) for i, m in enumerate(milestones)]
+        self.milestone_index = MilestoneIndex([node.x for node in self.nodes])
+        
+        # 视口在设计坐标中的宽度由屏幕宽高比决定，绘制时再按实际分辨率换算
+        if size is None:
+            size = (WIDTH, HEIGHT)
+        self.view_width = design_width(*size)
+        self.layout = None
+        
+        # 时间轴右侧留出与左侧相同的边距，超出屏幕宽度时由镜头平移
+        last_x = self.nodes[-1].x + TIMELINE_MARGIN if self.nodes else 0
+        self.world_width = max(self.view_width, last_x)
+        self.camera = Camera(self.view_width, self.world_width)
+        
+        # 本帧绘制时的插值系数（距离下一次模拟步的比例）
+        self.interp = 0.0
+        # 绘制用的镜头：draw() 时按 interp 插值，模拟仍使用 self.camera
+        self.view = self.camera
+        
+        # 逐阶段计时，默认不做统计
+        self.profiler = NULL_PROFILER
+        
+        # 特效质量档位，负载高时由 set_quality 降低
+        self.quality = QUALITY_LEVELS[0]
         self.connections = []
-        self.data_flows = []
+        self.data_flows = DataFlowField((GOLD, LIGHT_BLUE), max_flows=MAX_DATA_FLOWS, rng=rng)
         self.current_node = 0
         self.animation_time = 0
-        self.background_particles = []
         
-        # 创建背景粒子
-        for _ in range(50):
-            self.background_particles.append({
-                'x': random.randint(0, WIDTH),
-                'y': random.randint(0, HEIGHT),
-                'speed': random.uniform(0.1, 0.5),
-                'size': random.randint(1, 3)
-            })
+        # 创建背景星空
+        if star_count is None:
+            star_count = STAR_COUNT
+        self.starfield = Starfield(self.view_width, DESIGN_HEIGHT, star_count, LIGHT_BLUE, rng=rng)
+        
+        # 保留模式的场景：静态部分缓存为图层，只在输入变化时重绘
+        self.scene = self.build_scene()
         
     def update(self):
         self.animation_time += 1
         
         # 每隔一段时间激活下一个节点
         if self.animation_time % 120 == 0 and self.current_node < len(self.nodes):
-            self.nodes[self.current_node].activate()
+            self.nodes[self.current_node].activate(self.quality.count(PARTICLE_BURST))
+            # 镜头跟随最新激活的节点
+            self.camera.follow(self.nodes[self.current_node].x)
             
             # 创建连接线和数据流
             if self.current_node > 0:
@@ -186,124 +214,268 @@ class TechEvolutionAnimation:
                 curr_node = self.nodes[self.current_node]
                 
                 # 创建多条数据流
-                for _ in range(3):
-                    self.data_flows.append(DataFlow(
-                        prev_node.x, prev_node.y,
-                        curr_node.x, curr_node.y
-                    ))
+                self.data_flows.add(prev_node.x, prev_node.y, curr_node.x, curr_node.y,
+                                    FLOWS_PER_CONNECTION)
             
             self.current_node += 1
         
-        # 更新所有节点
-        for node in self.nodes:
-            node.update()
+        with self.profiler.phase("update_nodes"):
+            self.camera.update()
+            
+            # 只更新与视口相交的节点
+            lo, hi = self.visible_range()
+            for node in self.nodes[lo:hi]:
+                node.update()
+        
+        # 批量更新爆发粒子
+        with self.profiler.phase("update_particles"):
+            self.particle_system.update()
         
         # 更新数据流
-        for flow in self.data_flows:
-            flow.update()
+        with self.profiler.phase("update_flows"):
+            self.data_flows.update()
         
-        # 更新背景粒子
-        for particle in self.background_particles:
-            particle['x'] += particle['speed']
-            if particle['x'] > WIDTH:
-                particle['x'] = 0
-                particle['y'] = random.randint(0, HEIGHT)
+        # 更新背景星空
+        with self.profiler.phase("update_background"):
+            self.starfield.update()
+    
+    def visible_range(self, view=None):
+        """返回与视口相交的节点下标区间 (lo, hi)；view 为绘制所用的镜头，默认为当前镜头"""
+        left, right = (view or self.camera).visible(NODE_MARGIN)
+        return self.milestone_index.visible(left, right)
     
-    def draw_connections(self, surface):
-        # 绘制节点之间的连接线
-        for i in range(len(self.nodes) - 1):
+    def advance_to(self, frame):
+        """只推进模拟、不绘制，直到到达指定帧"""
+        while self.animation_time < frame:
+            self.update()
+    
+    def snapshot(self):
+        """返回当前模拟状态的副本（不含绘制缓存），可以用 restore() 回到这一刻"""
+        return {
+            "animation_time": self.animation_time,
+            "current_node": self.current_node,
+            "nodes": [(node.active, node.pulse) for node in self.nodes],
+            "camera": self.camera.snapshot(),
+            "rng": self.rng.bit_generator.state,
+            "particles": self.particle_system.snapshot(),
+            "flows": self.data_flows.snapshot(),
+            "stars": self.starfield.snapshot(),
+            # 自动调整特效质量时，激活节点爆发的粒子数取决于当时的档位
+            "quality": self.quality,
+        }
+    
+    def restore(self, state):
+        """恢复 snapshot() 保存的模拟状态；场景中的缓存图层按新状态自动重绘"""
+        self.animation_time = state["animation_time"]
+        self.current_node = state["current_node"]
+        for node, (active, pulse) in zip(self.nodes, state["nodes"]):
+            node.active = active
+            node.pulse = pulse
+        self.camera.restore(state["camera"])
+        self.rng.bit_generator.state = state["rng"]
+        self.particle_system.restore(state["particles"])
+        self.data_flows.restore(state["flows"])
+        self.starfield.restore(state["stars"])
+        self.set_quality(state["quality"])
+    
+    def set_quality(self, quality):
+        """切换特效质量档位
+
+        之后爆发的粒子数、节点光晕的圆环数、数据流的尾迹点数、绘制的背景星星数
+        都按档位缩减；已经存在的粒子不受影响。
+        """
+        self.quality = quality
+        self.data_flows.trail_points = quality.trail_points
+        self.starfield.density = quality.amount
+    
+    def layout_for(self, surface):
+        """返回与绘制表面尺寸对应的布局；场景中的缓存图层按分辨率自行重绘"""
+        if self.layout is None or self.layout.size != surface.get_size():
+            self.layout = Layout(*surface.get_size(), font_loader=load_font)
+        return self.layout
+    
+    def draw_connections(self, surface, view=None):
+        # 绘制节点之间的连接线（只处理可见节点及其左侧相邻节点）
+        layout = self.layout
+        view = view or self.camera
+        offset_x = view.offset
+        lo, hi = self.visible_range(view)
+        for i in range(max(lo - 1, 0), min(hi, len(self.nodes) - 1)):
             if self.nodes[i].active and self.nodes[i + 1].active:
-                start_x = self.nodes[i].x
-                start_y = self.nodes[i].y
-                end_x = self.nodes[i + 1].x
-                end_y = self.nodes[i + 1].y
+                start = layout.point(self.nodes[i].x - offset_x, self.nodes[i].y)
+                end = layout.point(self.nodes[i + 1].x - offset_x, self.nodes[i + 1].y)
                 
                 # 绘制渐变连接线
                 for j in range(5):
                     alpha = 100 - j * 20
                     color = (*LIGHT_BLUE, alpha) if j % 2 == 0 else (*GOLD, alpha)
-                    pygame.draw.line(surface, color[:3], 
-                                   (start_x, start_y), (end_x, end_y), 3 - j // 2)
+                    pygame.draw.line(surface, color[:3], start, end, layout.length(3 - j // 2))
+    
+    def cluster_marker(self, start, end, offset_x):
+        """返回一组密集节点的聚合标记：圆心、半径、颜色和标注节点数量的文字"""
+        layout = self.layout
+        count = end - start
+        center = layout.point(self.milestone_index.xs[start:end].mean() - offset_x, self.nodes[start].y)
+        # 节点按顺序激活，组内第一个节点激活即视为整组已激活
+        color = GOLD if self.nodes[start].active else DARK_GOLD
+        radius = layout.length(min(LOD_CELL // 2 - 5, int(8 + 4 * math.log2(count))))
+        count_text = text_cache.render(layout.font(TEXT_SIZE), str(count), color)
+        return center, radius, color, count_text
     
-    def draw_background(self, surface):
-        # 绘制背景粒子
-        for particle in self.background_particles:
-            pygame.draw.circle(surface, LIGHT_BLUE, 
-                             (int(particle['x']), int(particle['y'])), 
-                             particle['size'])
+    def draw_cluster(self, surface, start, end, offset_x):
+        """把过于密集的一组节点绘制为一个聚合标记，标注节点数量"""
+        center, radius, color, count_text = self.cluster_marker(start, end, offset_x)
+        pygame.draw.circle(surface, DEEP_BLUE, center, radius)
+        pygame.draw.circle(surface, color, center, radius, self.layout.length(2))
+        surface.blit(count_text, count_text.get_rect(center=center))
     
     def draw_timeline(self, surface):
-        # 绘制时间轴
-        pygame.draw.line(surface, GOLD, (50, HEIGHT // 2), (WIDTH - 50, HEIGHT // 2), 2)
-        
-        # 绘制时间轴装饰
-        for i in range(0, WIDTH, 50):
-            y = HEIGHT // 2 + 5 * math.sin(self.animation_time * 0.01 + i * 0.01)
-            pygame.draw.circle(surface, LIGHT_BLUE, (i, int(y)), 1)
+        """绘制时间轴主轴，再在其上绘制装饰波浪"""
+        self.draw_timeline_axis(surface)
+        self.draw_timeline_decoration(surface)
     
-    def draw_title(self, surface):
-        # 绘制标题
-        title_text = title_font.render("人类科技进步之路", True, GOLD)
-        title_rect = title_text.get_rect(center=(WIDTH // 2, 50))
-        surface.blit(title_text, title_rect)
-        
-        # 绘制副标题
-        subtitle_text = subtitle_font.render("从四大发明到人工智能", True, WHITE)
-        subtitle_rect = subtitle_text.get_rect(center=(WIDTH // 2, 100))
-        surface.blit(subtitle_text, subtitle_rect)
+    def timeline_rects(self):
+        # 主轴和波浪始终位于时间轴附近的一条水平带内
+        band = WAVE_AMPLITUDE + 2
+        return [pygame.Rect(0, self.layout.px(TIMELINE_Y - band), self.layout.width, self.layout.length(band * 2))]
     
-    def draw(self, surface):
-        # 填充背景
-        surface.fill(DEEP_BLUE)
-        
-        # 绘制背景效果
-        self.draw_background(surface)
-        
-        # 绘制时间轴
-        self.draw_timeline(surface)
-        
-        # 绘制连接线
-        self.draw_connections(surface)
-        
-        # 绘制数据流
-        for flow in self.data_flows:
-            flow.draw(surface)
-        
-        # 绘制节点
-        for node in self.nodes:
-            node.draw(surface)
-        
-        # 绘制标题
-        self.draw_title(surface)
+    def draw_timeline_axis(self, surface):
+        # 绘制时间轴（只绘制视口内的一段）
+        offset_x = self.view.offset
+        left, right = self.view.visible()
+        line_start = self.layout.point(max(50, left) - offset_x, TIMELINE_Y)
+        line_end = self.layout.point(min(self.world_width - 50, right) - offset_x, TIMELINE_Y)
+        pygame.draw.line(surface, GOLD, line_start, line_end, self.layout.length(2))
+    
+    def draw_timeline_decoration(self, surface):
+        # 绘制时间轴装饰，装饰点按世界坐标对齐，随镜头平移
+        offset_x = self.view.offset
+        left, right = self.view.visible()
+        render_time = self.animation_time + self.interp
+        xs, offsets = wave(left, right, WAVE_SPACING, render_time * 0.01, WAVE_AMPLITUDE, 0.01)
+        scale = self.layout.scale
+        px = ((xs - offset_x) * scale).astype(np.int32)
+        py = ((TIMELINE_Y + offsets) * scale).astype(np.int32)
+        draw_dots(surface, px, py, self.layout.length(1), LIGHT_BLUE)
+    
+    def draw_nodes(self, surface):
+        """绘制可见节点，密集的节点聚合为细节层次标记"""
+        offset_x = self.view.offset
+        lo, hi = self.visible_range(self.view)
+        for start, end in self.milestone_index.clusters(lo, hi, LOD_CELL):
+            if end - start == 1:
+                self.nodes[start].draw(surface, self.layout, offset_x, self.interp, self.quality.glow_rings)
+            else:
+                self.draw_cluster(surface, start, end, offset_x)
+    
+    def node_rects(self):
+        """返回 draw_nodes() 将要绘制的区域"""
+        offset_x = self.view.offset
+        lo, hi = self.visible_range(self.view)
+        rects = []
+        for start, end in self.milestone_index.clusters(lo, hi, LOD_CELL):
+            if end - start == 1:
+                rects.append(self.nodes[start].bounds(self.layout, offset_x, self.quality.glow_rings))
+            else:
+                (x, y), radius, _, count_text = self.cluster_marker(start, end, offset_x)
+                rect = pygame.Rect(x - radius, y - radius, radius * 2 + 1, radius * 2 + 1)
+                rects.append(rect.union(count_text.get_rect(center=(x, y))))
+        return rects
+    
+    def title_lines(self):
+        """返回标题与副标题的文字表面及其在画面上的位置"""
+        layout = self.layout
+        title_text = text_cache.render(layout.font(TITLE_SIZE), "人类科技进步之路", GOLD)
+        subtitle_text = text_cache.render(layout.font(SUBTITLE_SIZE), "从四大发明到人工智能", WHITE)
+        return [
+            (title_text, title_text.get_rect(center=(layout.width // 2, layout.px(50)))),
+            (subtitle_text, subtitle_text.get_rect(center=(layout.width // 2, layout.px(100)))),
+        ]
+    
+    def title_bounds(self):
+        lines = self.title_lines()
+        return lines[0][1].union(lines[1][1])
+    
+    def render_title(self, surface):
+        # 绘制标题层，坐标相对于标题与副标题的外接矩形
+        bounds = self.title_bounds()
+        for text, rect in self.title_lines():
+            surface.blit(text, rect.move(-bounds.x, -bounds.y))
+    
+    def world_strip(self):
+        """返回静态世界层缓存条带的 (左边缘的世界坐标, 宽度)，条带始终覆盖整个视口"""
+        step = max(1, int(self.view_width * WORLD_STRIP_STEP))
+        return self.view.offset // step * step, int(math.ceil(self.view_width)) + step
+    
+    def world_key(self):
+        return self.current_node, self.world_strip()[0], self.layout.size
+    
+    def world_bounds(self):
+        layout = self.layout
+        left, width = self.world_strip()
+        return pygame.Rect(layout.px(left - self.view.offset), 0, layout.length(width), layout.height)
+    
+    def render_world(self, surface):
+        """绘制静态世界层：节点之间的连接线"""
+        left, width = self.world_strip()
+        view = Camera(width, self.world_width)
+        view.x = left
+        self.draw_connections(surface, view)
+    
+    def system_layer(self, name, system):
+        """把星空、数据流、爆发粒子这类带 draw / dirty_rects 接口的子系统包装为动态图层"""
+        return DynamicLayer(
+            name,
+            lambda surface: system.draw(surface, self.view.offset, self.interp, self.layout.scale),
+            lambda: system.dirty_rects(self.view.offset, self.interp, self.layout.scale))
+    
+    def build_scene(self):
+        """创建保留模式的场景，图层从下到上依次为：
 
-# 主程序
-def main():
-    clock = pygame.time.Clock()
-    animation = TechEvolutionAnimation()
-    running = True
+        背景星空（远处的星星随镜头平移得更少）、时间轴主轴与装饰波浪、连接线、数据流、节点、
+        爆发粒子、标题。连接线所在的世界层只在节点激活、镜头越过缓存条带或分辨率变化时重绘，
+        标题层只在分辨率变化时重绘，其余图层每帧重绘。
+        """
+        return Scene(DEEP_BLUE, [
+            self.system_layer("background", self.starfield),
+            DynamicLayer("timeline", self.draw_timeline, self.timeline_rects),
+            CachedLayer("world", self.render_world, self.world_key, self.world_bounds, colorkey=DEEP_BLUE),
+            self.system_layer("flows", self.data_flows),
+            DynamicLayer("nodes", self.draw_nodes, self.node_rects),
+            self.system_layer("particles", self.particle_system),
+            CachedLayer("title", self.render_title, lambda: self.layout.size, self.title_bounds),
+        ])
     
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    running = False
-                elif event.key == pygame.K_SPACE:
-                    # 重置动画
-                    animation = TechEvolutionAnimation()
-        
-        # 更新动画
-        animation.update()
-        
-        # 绘制
-        animation.draw(screen)
-        
-        # 更新显示
-        pygame.display.flip()
-        clock.tick(60)
+    def draw(self, surface, interp=0.0):
+        """合成整帧：缓存图层按需重绘后直接 blit，其余图层每帧重绘"""
+        self.interp = interp
+        self.view = self.camera.interpolated(interp)
+        self.layout_for(surface)
+        self.scene.draw(surface, self.profiler)
     
-    pygame.quit()
+    def object_counts(self):
+        """当前的对象数量，供性能统计使用"""
+        lo, hi = self.visible_range()
+        return {
+            "particles": self.particle_system.count,
+            "flows": len(self.data_flows),
+            "nodes": hi - lo,
+        }
+    
+    def draw_dirty(self, surface, interp=0.0):
+        """脏矩形模式绘制，返回需要刷新到屏幕的矩形列表
+
+        与 draw() 合成同一个场景，但只在上一帧与本帧动态图层所在的区域内按图层顺序重新合成；
+        节点激活、镜头越过缓存条带时整屏重绘。
+        """
+        self.interp = interp
+        self.view = self.camera.interpolated(interp)
+        self.layout_for(surface)
+        return self.scene.draw_dirty(surface, self.profiler)
+
+# 主程序：命令行参数与播放循环由 player 模块提供，两个版本共用
+def main():
+    player.main(sys.modules[__name__], "basic")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,20 +1,12 @@
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import numpy as np
-from matplotlib.patches import Circle, FancyBboxPatch
+from matplotlib.collections import EllipseCollection, LineCollection
+from matplotlib.colors import to_rgba
 from matplotlib.lines import Line2D
-import matplotlib.font_manager as fm
+from fonts import configure_matplotlib
 
-# 设置中文字体
-plt.rcParams['font.sans-serif'] = ['Microsoft YaHei']
-plt.rcParams['axes.unicode_minus'] = False
-
-# 创建图形和坐标轴
-fig, ax = plt.subplots(figsize=(16, 9), facecolor='#001428')
-ax.set_xlim(0, 12)
-ax.set_ylim(0, 8)
-ax.set_aspect('equal')
-ax.axis('off')
+# 导入本模块只定义数据和函数，图形在 build_animation() 中创建
 
 # 定义颜色
 DEEP_BLUE = '#001428'
@@ -34,120 +26,145 @@ milestones = [
     {"name": "人工智能", "year": "2020s", "x": 10.5, "y": 4}
 ]
 
-# 创建标题
-title = ax.text(6, 7, '人类科技进步之路', fontsize=36, color=GOLD, 
-                ha='center', va='center', weight='bold')
-subtitle = ax.text(6, 6.3, '从四大发明到人工智能', fontsize=24, color=WHITE,
-                   ha='center', va='center')
+# 节点与背景粒子的数量
+NODE_COUNT = len(milestones)
+PARTICLE_COUNT = 30
+NODE_RADIUS = 0.2
+PARTICLE_RADIUS = 0.02
 
-# 创建时间轴
-timeline = Line2D([0.5, 11.5], [4, 4], linewidth=3, color=GOLD, alpha=0.6)
-ax.add_line(timeline)
+# 动画参数
+FRAMES = 300  # 一遍动画的帧数
+INTERVAL = 50  # 帧间隔（毫秒）
 
-# 存储所有图形对象
-nodes = []
-node_texts = []
-year_texts = []
-connections = []
-particles = []
+def build_animation(particle_count=PARTICLE_COUNT, seed=None):
+    """创建图形和全部图形对象，返回 (fig, animate)
 
-# 创建节点
-for i, milestone in enumerate(milestones):
-    # 创建节点圆圈
-    node = Circle((milestone['x'], milestone['y']), 0.2, 
-                  facecolor=DEEP_BLUE, edgecolor=GOLD, linewidth=2)
-    ax.add_patch(node)
-    nodes.append(node)
+    animate(frame) 按顺序推进一帧，返回需要重绘的图形对象；每次调用本函数都得到一份独立的动画状态。
+    """
+    # 设置中文字体：注册字体注册表找到的中文字体，找不到时保留 matplotlib 的默认字体
+    configure_matplotlib()
+    plt.rcParams['axes.unicode_minus'] = False
+    rng = np.random.default_rng(seed)
     
-    # 创建节点文本
-    text = ax.text(milestone['x'], milestone['y'] + 0.6, milestone['name'],
-                   fontsize=14, color=WHITE, ha='center', va='bottom', alpha=0)
-    node_texts.append(text)
+    # 创建图形和坐标轴
+    fig, ax = plt.subplots(figsize=(16, 9), facecolor='#001428')
+    ax.set_xlim(0, 12)
+    ax.set_ylim(0, 8)
+    ax.set_aspect('equal')
+    ax.axis('off')
     
-    # 创建年份文本
-    year = ax.text(milestone['x'], milestone['y'] - 0.6, milestone['year'],
-                   fontsize=12, color=GOLD, ha='center', va='top', alpha=0)
-    year_texts.append(year)
+    # 创建标题
+    title = ax.text(6, 7, '人类科技进步之路', fontsize=36, color=GOLD, 
+                    ha='center', va='center', weight='bold')
+    subtitle = ax.text(6, 6.3, '从四大发明到人工智能', fontsize=24, color=WHITE,
+                       ha='center', va='center')
     
-    # 创建连接线（除了第一个节点）
-    if i > 0:
-        prev = milestones[i-1]
-        line = Line2D([prev['x'], milestone['x']], [prev['y'], milestone['y']],
-                     linewidth=2, color=LIGHT_BLUE, alpha=0)
-        ax.add_line(line)
-        connections.append(line)
-
-# 创建背景粒子
-for _ in range(30):
-    x = np.random.uniform(0, 12)
-    y = np.random.uniform(0, 8)
-    particle = Circle((x, y), 0.02, facecolor=LIGHT_BLUE, alpha=0.3)
-    ax.add_patch(particle)
-    particles.append(particle)
-
-# 动画参数
-frame_count = 0
-active_nodes = []
-
-def animate(frame):
-    global frame_count, active_nodes
-    frame_count = frame
+    # 创建时间轴
+    timeline = Line2D([0.5, 11.5], [4, 4], linewidth=3, color=GOLD, alpha=0.6)
+    ax.add_line(timeline)
+    
+    # 节点：所有圆圈放在一个 EllipseCollection 中，直径与填充色按数组整体更新
+    node_xy = np.array([(m['x'], m['y']) for m in milestones], dtype=float)
+    node_sizes = np.full(NODE_COUNT, 2 * NODE_RADIUS)
+    node_colors = np.tile(to_rgba(DEEP_BLUE), (NODE_COUNT, 1))
+    nodes = EllipseCollection(node_sizes, node_sizes, np.zeros(NODE_COUNT), units='xy',
+                              offsets=node_xy, offset_transform=ax.transData,
+                              facecolors=node_colors, edgecolors=GOLD, linewidths=2)
+    ax.add_collection(nodes)
+    
+    # 节点文字在激活前隐藏，隐藏的文字不参与绘制
+    node_texts = []
+    year_texts = []
+    for milestone in milestones:
+        # 创建节点文本
+        text = ax.text(milestone['x'], milestone['y'] + 0.6, milestone['name'],
+                       fontsize=14, color=WHITE, ha='center', va='bottom', visible=False)
+        node_texts.append(text)
+        
+        # 创建年份文本
+        year = ax.text(milestone['x'], milestone['y'] - 0.6, milestone['year'],
+                       fontsize=12, color=GOLD, ha='center', va='top', visible=False)
+        year_texts.append(year)
     
-    # 背景粒子动画
-    for particle in particles:
-        x, y = particle.center
-        x += 0.02
-        if x > 12:
-            x = 0
-            y = np.random.uniform(0, 8)
-        particle.center = (x, y)
+    # 连接线：第 i 条连接第 i 与 i+1 个节点，透明度与线宽按数组整体更新
+    connection_colors = np.tile(to_rgba(LIGHT_BLUE), (NODE_COUNT - 1, 1))
+    connection_colors[:, 3] = 0
+    connections = LineCollection(np.stack([node_xy[:-1], node_xy[1:]], axis=1),
+                                 colors=connection_colors, linewidths=2)
+    ax.add_collection(connections)
     
-    # 激活节点的逻辑
-    node_interval = 30  # 每30帧激活一个节点
-    current_node_index = min(frame // node_interval, len(nodes) - 1)
+    # 背景粒子：位置存放在一个数组中，每帧一次赋值
+    particle_xy = np.column_stack([rng.uniform(0, 12, particle_count),
+                                   rng.uniform(0, 8, particle_count)])
+    particle_sizes = np.full(particle_count, 2 * PARTICLE_RADIUS)
+    particles = EllipseCollection(particle_sizes, particle_sizes, np.zeros(particle_count), units='xy',
+                                  offsets=particle_xy, offset_transform=ax.transData,
+                                  facecolors=LIGHT_BLUE, edgecolors='none', alpha=0.3)
+    ax.add_collection(particles)
     
-    # 激活当前节点
-    if current_node_index not in active_nodes and frame % node_interval == 0:
-        active_nodes.append(current_node_index)
+    active_nodes = []
     
-    # 更新所有激活的节点
-    for idx in active_nodes:
-        node = nodes[idx]
-        text = node_texts[idx]
-        year = year_texts[idx]
+    def animate(frame):
+        # 背景粒子动画：漂出右边缘的粒子回到左边缘并换一个高度
+        particle_xy[:, 0] += 0.02
+        wrapped = particle_xy[:, 0] > 12
+        if wrapped.any():
+            particle_xy[wrapped, 0] = 0
+            particle_xy[wrapped, 1] = rng.uniform(0, 8, np.count_nonzero(wrapped))
+        particles.set_offsets(particle_xy)
         
-        # 节点脉动效果
-        scale = 1 + 0.2 * np.sin(frame * 0.1 + idx)
-        node.set_radius(0.2 * scale)
-        node.set_facecolor(GOLD)
+        # 激活节点的逻辑
+        node_interval = 30  # 每30帧激活一个节点
+        current_node_index = min(frame // node_interval, NODE_COUNT - 1)
         
-        # 显示文本
-        text.set_alpha(1)
-        year.set_alpha(1)
+        # 激活当前节点：填充色变为金色，显示文本
+        if current_node_index not in active_nodes and frame % node_interval == 0:
+            active_nodes.append(current_node_index)
+            node_colors[current_node_index] = to_rgba(GOLD)
+            nodes.set_facecolors(node_colors)
+            node_texts[current_node_index].set_visible(True)
+            year_texts[current_node_index].set_visible(True)
         
-        # 显示连接线
-        if idx > 0 and idx - 1 < len(connections):
-            connections[idx - 1].set_alpha(0.8)
-            
-            # 数据流动效果
-            progress = (frame % 20) / 20
-            if progress < 0.5:
-                connections[idx - 1].set_linewidth(2 + progress * 4)
-            else:
-                connections[idx - 1].set_linewidth(4 - (progress - 0.5) * 4)
-    
-    # 标题闪烁效果
-    title.set_alpha(0.8 + 0.2 * np.sin(frame * 0.05))
+        # 激活节点的脉动效果
+        active = np.array(active_nodes, dtype=int)
+        node_sizes[active] = 2 * NODE_RADIUS * (1 + 0.2 * np.sin(frame * 0.1 + active))
+        nodes.set_widths(node_sizes)
+        nodes.set_heights(node_sizes)
+        
+        # 显示连接线，并让激活的连接线随数据流动改变线宽
+        linked = active[active > 0] - 1
+        connection_colors[linked, 3] = 0.8
+        progress = (frame % 20) / 20
+        if progress < 0.5:
+            width = 2 + progress * 4
+        else:
+            width = 4 - (progress - 0.5) * 4
+        connection_widths = np.full(NODE_COUNT - 1, 2.0)
+        connection_widths[linked] = width
+        connections.set_color(connection_colors)
+        connections.set_linewidths(connection_widths)
+        
+        # 标题闪烁效果
+        title.set_alpha(0.8 + 0.2 * np.sin(frame * 0.05))
+        
+        # 只返回需要重绘的对象：副标题与未激活节点的文字保持不变，不交给 blit 重绘
+        shown = [node_texts[i] for i in active_nodes] + [year_texts[i] for i in active_nodes]
+        return [nodes, connections, particles, title] + shown
     
-    return nodes + node_texts + year_texts + connections + particles + [title, subtitle]
+    return fig, animate
 
-# 创建动画
-anim = animation.FuncAnimation(fig, animate, frames=300, interval=50, 
-                              repeat=True, blit=True)
-
-# 保存动画为GIF（可选）
-# anim.save('tech_evolution.gif', writer='pillow', fps=20)
+def main():
+    fig, animate = build_animation()
+    
+    # 创建动画
+    anim = animation.FuncAnimation(fig, animate, frames=FRAMES, interval=INTERVAL,
+                                  repeat=True, blit=True)
+    
+    # 导出 GIF 或视频请使用 matplotlib_export.py，逐帧流式写出，内存占用与帧数无关
+    
+    # 显示动画
+    plt.tight_layout()
+    plt.show()
 
-# 显示动画
-plt.tight_layout()
-plt.show() 
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+from collections import OrderedDict
+
+
+class TextCache:
+    """文字表面缓存
+
+    以 (字体, 文字, 颜色, 透明度) 为键缓存 font.render 的结果，按最近最少使用淘汰。
+    中文字体的光栅化开销很大，而标题、节点名称等文字每帧都不变，没有必要重复渲染。
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, alpha=None):
+        """返回渲染好的文字表面；alpha 为 None 时不设置整体透明度"""
+        key = (font, text, tuple(color), alpha)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        if alpha is not None:
+            surface.set_alpha(alpha)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+
+# 所有 pygame 脚本共用的缓存实例
+text_cache = TextCache()
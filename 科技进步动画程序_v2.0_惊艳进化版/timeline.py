@@ -0,0 +1,64 @@
+from collections import deque
+
+# 检查点间隔（模拟步）：与节点激活间隔相同，跳转时最多补算 2 秒的模拟
+CHECKPOINT_INTERVAL = 120
+# keep_until 之后最多保留的检查点数：约最近 1 分钟的播放历史
+RECENT_CHECKPOINTS = 30
+
+
+class Timeline:
+    """可随机跳转的播放时间线
+
+    包装一个带 update() / snapshot() / restore() 的动画，每隔 interval 步保存一次模拟状态
+    （含随机数发生器的状态）。跳转到第 N 步时从不晚于 N 的最近检查点恢复，再向前补算；
+    检查点齐全时最多补算 interval - 1 步，代价与 N 无关。检查点在第一次经过时记录，
+    向前跳到尚未到过的位置时沿途补记，之后来回拖动都只需一次恢复加少量补算。
+    快照包含动画的全部模拟状态（含特效质量档位），同一种子下跳转得到的状态与当初逐步推进到这里时完全相同。
+
+    第 keep_until 步及以前的检查点（通常是完整播放一遍的长度）一直保留；之后的检查点只保留
+    最近记录的 recent 个，更早的按记录顺序淘汰，长时间无人值守播放时内存不会持续增长。
+    检查点总数不超过 keep_until // interval + 1 + recent。跳到已淘汰的位置时从更早的检查点补算，
+    结果不变，只是耗时更长。
+    """
+
+    def __init__(self, animation, interval=CHECKPOINT_INTERVAL, keep_until=0, recent=RECENT_CHECKPOINTS):
+        self.animation = animation
+        self.interval = interval
+        self.keep_until = keep_until
+        self.recent = recent
+        self.checkpoints = {}
+        # keep_until 之后的检查点，按记录顺序排列
+        self._recent = deque()
+        self._record()
+
+    @property
+    def frame(self):
+        """当前的模拟步数"""
+        return self.animation.animation_time
+
+    def _record(self):
+        frame = self.frame
+        if frame % self.interval == 0 and frame not in self.checkpoints:
+            self.checkpoints[frame] = self.animation.snapshot()
+            if frame > self.keep_until:
+                self._recent.append(frame)
+                if len(self._recent) > self.recent:
+                    del self.checkpoints[self._recent.popleft()]
+
+    def step(self):
+        """推进一步模拟，经过检查点时记录状态"""
+        self.animation.update()
+        self._record()
+
+    def seek(self, frame):
+        """跳转到第 frame 步的状态（负数按 0 处理）"""
+        frame = max(0, int(frame))
+        # 不晚于目标的最近检查点；第 0 步的检查点总是存在
+        base = frame - frame % self.interval
+        while base not in self.checkpoints:
+            base -= self.interval
+        # 当前位置位于检查点与目标之间时直接向前推进即可
+        if not base <= self.frame <= frame:
+            self.animation.restore(self.checkpoints[base])
+        while self.frame < frame:
+            self.step()
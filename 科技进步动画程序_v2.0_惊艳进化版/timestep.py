@@ -0,0 +1,33 @@
+# 模拟频率：所有运动参数（粒子寿命、数据流速度、节点间隔 120 帧等）都按每秒 60 步设计
+SIM_HZ = 60
+SIM_STEP = 1.0 / SIM_HZ
+
+
+class FixedTimestep:
+    """固定步长的模拟时钟
+
+    把每帧实际经过的时间累加起来，按固定步长消耗，得到本帧需要执行的模拟步数；
+    剩余不足一步的时间比例作为绘制时的插值系数。这样无论显示器是 30Hz 还是 144Hz，
+    也无论某一帧是否变慢，节点激活等事件都发生在相同的时刻。
+    """
+
+    def __init__(self, step=SIM_STEP, max_frame_time=0.25):
+        self.step = step
+        # 单帧计入的最长时间，避免窗口被拖动等长时间卡顿后一次补算过多步
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+
+    def advance(self, frame_time):
+        """计入一帧经过的秒数，返回需要执行的模拟步数"""
+        self.accumulator += min(frame_time, self.max_frame_time)
+        steps = int(self.accumulator // self.step)
+        self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def interp(self):
+        """距离下一步的比例 [0, 1)，用于在两步之间插值绘制"""
+        return self.accumulator / self.step
+
+    def reset(self):
+        self.accumulator = 0.0